@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
+DB_NAME = "jobs.db"
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        payload BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS mix_history (
+        job_id TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        payload BLOB NOT NULL,
+        PRIMARY KEY (job_id, position)
+    )
+    """,
+)
+
+# Columns added after the first release; older databases get them via ALTER TABLE.
+_JOB_COLUMNS = (("updated_at", "REAL"),)
+
+_INDEXES = ("CREATE INDEX IF NOT EXISTS ix_jobs_updated ON jobs (updated_at DESC)",)
+
+_connections: dict[Path, sqlite3.Connection] = {}
+_lock = threading.RLock()
+
+
+def db_path(root: Path) -> Path:
+    return root / DB_NAME
+
+
+def _connect(root: Path) -> sqlite3.Connection:
+    path = db_path(root)
+    conn = _connections.get(path)
+    if conn is None:
+        root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        missing = [(name, kind) for name, kind in _JOB_COLUMNS if name not in existing]
+        if missing:
+            conn.execute("BEGIN")
+            try:
+                for name, kind in missing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {kind}")
+                _backfill_columns(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        for statement in _INDEXES:
+            conn.execute(statement)
+        _connections[path] = conn
+    return conn
+
+
+def _backfill_columns(conn: sqlite3.Connection) -> None:
+    # Rows written before updated_at existed only carry it inside the payload.
+    rows = conn.execute(
+        "SELECT id, payload, created_at FROM jobs WHERE updated_at IS NULL"
+    ).fetchall()
+    updates = [(_updated_at(_loads(raw), created_at), job_id) for job_id, raw, created_at in rows]
+    conn.executemany("UPDATE jobs SET updated_at = ? WHERE id = ?", updates)
+
+
+def _json_default(value: Any) -> Any:
+    # stdlib fallback for the types orjson encodes natively.
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        value, ensure_ascii=True, separators=(",", ":"), default=_json_default
+    ).encode("utf-8")
+
+
+def _loads(raw: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _timestamp(value: Any) -> float | None:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return value
+
+
+def _updated_at(payload: dict, created_at: float) -> float:
+    try:
+        updated_at = _timestamp(payload.get("updated_at"))
+    except (TypeError, ValueError):
+        updated_at = None
+    if updated_at is None:
+        updated_at = created_at
+    return updated_at
+
+
+def save_job(
+    root: Path,
+    job_id: str,
+    created_at: float,
+    payload: dict,
+    history: list[dict] | None = None,
+) -> None:
+    save_jobs(root, [(job_id, created_at, payload, history)])
+
+
+def save_jobs(
+    root: Path,
+    records: Iterable[tuple[str, float, dict, list[dict] | None]],
+) -> None:
+    # One transaction for a batch of (job_id, created_at, payload, history) records.
+    # The job row never carries mix_history; pass `history` only when it changed so
+    # status updates don't rewrite the history rows.
+    rows = []
+    history_rows = []
+    history_ids = []
+    for job_id, created_at, payload, history in records:
+        row = {key: value for key, value in payload.items() if key != "mix_history"}
+        rows.append((job_id, _dumps(row), created_at, _updated_at(row, created_at)))
+        if history is not None:
+            history_ids.append((job_id,))
+            history_rows.extend((job_id, idx, _dumps(item)) for idx, item in enumerate(history))
+    if not rows:
+        return
+    with _lock:
+        conn = _connect(root)
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO jobs (id, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany("DELETE FROM mix_history WHERE job_id = ?", history_ids)
+            conn.executemany(
+                "INSERT INTO mix_history (job_id, position, payload) VALUES (?, ?, ?)",
+                history_rows,
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def load_jobs(root: Path) -> list[dict]:
+    # Walks ix_jobs_updated (backwards) instead of sorting the table.
+    with _lock:
+        conn = _connect(root)
+        rows = conn.execute("SELECT id, payload FROM jobs ORDER BY updated_at").fetchall()
+        history_rows = conn.execute(
+            "SELECT job_id, payload FROM mix_history ORDER BY job_id, position"
+        ).fetchall()
+    history: dict[str, list[dict]] = {}
+    for job_id, item in history_rows:
+        history.setdefault(job_id, []).append(_loads(item))
+    payloads: list[dict] = []
+    for job_id, raw in rows:
+        payload = _loads(raw)
+        if job_id in history:
+            payload["mix_history"] = history[job_id]
+        payloads.append(payload)
+    return payloads
+
+
+def delete_job(root: Path, job_id: str) -> bool:
+    return delete_jobs(root, [job_id]) > 0
+
+
+def delete_jobs(root: Path, job_ids: Iterable[str]) -> int:
+    params = [(job_id,) for job_id in job_ids]
+    if not params:
+        return 0
+    with _lock:
+        conn = _connect(root)
+        conn.execute("BEGIN")
+        try:
+            cursor = conn.executemany("DELETE FROM jobs WHERE id = ?", params)
+            deleted = cursor.rowcount
+            conn.executemany("DELETE FROM mix_history WHERE job_id = ?", params)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    return deleted
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import anyio.to_thread
 from fastapi import FastAPI
 
 from app.api.routes_assets import router as assets_router
 from app.api.routes_jobs import router as jobs_router
+from app.core.config import settings
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Sync handlers share anyio's default limiter (40 tokens); raise it so parallel
+    # preview/asset requests are not queued behind long uploads.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = max(1, settings.api_threadpool_size)
+    yield
+
 
-app = FastAPI(title="SAM-Audio API")
+app = FastAPI(title="SAM-Audio API", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -4,14 +4,44 @@ from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
 
 from app.core import audio_io
 
 router = APIRouter(prefix="/assets", tags=["assets"])
 
+_ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+_PATHSEND_EXTENSION = "http.response.pathsend"
+
+
+class ZeroCopyFileResponse(FileResponse):
+    # Hand the open file to the server (sendfile) when it advertises zerocopysend.
+    # pathsend is already handled by Starlette; HEAD and Range requests keep the
+    # chunked path.
+    _zerocopy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        extensions = scope.get("extensions") or {}
+        self._zerocopy = (
+            scope["type"] == "http"
+            and _ZEROCOPY_EXTENSION in extensions
+            and _PATHSEND_EXTENSION not in extensions
+        )
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool, send_pathsend: bool) -> None:
+        if send_header_only or send_pathsend or not self._zerocopy:
+            await super()._handle_simple(send, send_header_only, send_pathsend)
+            return
+        await send(
+            {"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers}
+        )
+        with open(self.path, "rb") as handle:
+            await send({"type": _ZEROCOPY_EXTENSION, "file": handle, "more_body": False})
+
 
 @router.get("/{job_id}/output")
-def get_output(job_id: str, name: str | None = None) -> FileResponse:
+def get_output(job_id: str, name: str | None = None) -> ZeroCopyFileResponse:
     output_dir = Path("data/outputs") / job_id
     output_name = name or "output.wav"
     if Path(output_name).name != output_name or not output_name.endswith(".wav"):
@@ -19,7 +49,7 @@ def get_output(job_id: str, name: str | None = None) -> FileResponse:
     output_path = output_dir / output_name
     if not output_path.exists():
         raise HTTPException(status_code=404, detail="output not available")
-    return FileResponse(output_path)
+    return ZeroCopyFileResponse(output_path)
 
 
 @router.get("/{job_id}/input")
@@ -27,7 +57,7 @@ def get_input(
     job_id: str,
     preview_seconds: float | None = None,
     preview_start: float | None = None,
-) -> FileResponse:
+) -> ZeroCopyFileResponse:
     input_path = Path("data/uploads") / job_id / "input.wav"
     if not input_path.exists():
         raise HTTPException(status_code=404, detail="input not available")
@@ -35,18 +65,18 @@ def get_input(
         start = float(preview_start or 0.0)
         if start < 0:
             start = 0.0
-        audio, sr = audio_io.read_audio(input_path, mono=True)
-        duration = audio.shape[0] / float(sr) if sr else 0.0
+        duration = audio_io.audio_duration(input_path)
         if duration <= 0 or start >= duration:
             raise HTTPException(status_code=400, detail="preview_start exceeds audio length")
         end = min(start + float(preview_seconds), duration)
-        preview_audio = audio_io.slice_audio(audio, sr, start, end)
         output_dir = Path("data/outputs") / job_id
         output_dir.mkdir(parents=True, exist_ok=True)
         start_ms = int(round(start * 1000))
         duration_ms = int(round((end - start) * 1000))
         preview_path = output_dir / f"input-preview-{start_ms}ms-{duration_ms}ms.wav"
         if not preview_path.exists():
-            audio_io.write_audio(preview_path, preview_audio, sr)
-        return FileResponse(preview_path)
-    return FileResponse(input_path)
+            preview_audio, sr = audio_io.read_audio_window(input_path, start, end, mono=True)
+            # Playback-only, so 16-bit halves the bytes served.
+            audio_io.write_audio(preview_path, preview_audio, sr, subtype="PCM_16")
+        return ZeroCopyFileResponse(preview_path)
+    return ZeroCopyFileResponse(input_path)
@@ -1,17 +1,19 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
 import shutil
 import threading
 import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
+from app.api import job_store
 from app.api.schemas import (
     CleanupRequest,
     Job,
@@ -34,103 +36,314 @@ _output_root = Path("data/outputs")
 _cache_root = Path("data/cache")
 _job_store_root = Path("data/jobs")
 _allowed_suffixes = {".wav", ".mp3", ".m4a", ".mp4"}
+_upload_chunk_bytes = 1 << 20
 _job_files: dict[str, dict[str, Path]] = {}
 _mix_states: dict[str, MixResponse] = {}
 _mix_tokens: dict[str, str] = {}
+# _jobs, _mix_states and _mix_tokens are copy-on-write snapshots: writers build a
+# new dict under the lock and rebind the name, readers just grab the current dict.
 _mix_lock = threading.Lock()
 _jobs_lock = threading.Lock()
+_persist_lock = threading.Lock()
+_dirty_jobs: set[str] = set()
+_flush_event = threading.Event()
+_flush_interval_seconds = 1.0
+_flush_thread: threading.Thread | None = None
+_trash_marker = ".deleting-"
+_purge_workers = 4
+
+
+def _mix_worker_count(configured: int) -> int:
+    # MIX_WORKERS <= 0 means "auto": leave one core for the request loop.
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# Mixes run on a bounded pool shared by all requests; extra mixes wait in its queue.
+_mix_executor = ThreadPoolExecutor(
+    max_workers=_mix_worker_count(settings.mix_workers),
+    thread_name_prefix="mix",
+)
+_mix_futures: dict[str, Future] = {}
 
 _job_store_root.mkdir(parents=True, exist_ok=True)
 
 
-def _json_default(value: object) -> str:
-    if isinstance(value, datetime):
-        return value.isoformat()
-    return str(value)
+def _submit_mix(job_id: str, run) -> None:
+    future = _mix_executor.submit(run)
+    with _mix_lock:
+        previous = _mix_futures.get(job_id)
+        _mix_futures[job_id] = future
+    if previous is not None:
+        # A forced re-mix supersedes a queued one; a running one stops on its token.
+        previous.cancel()
 
+    def _forget(done: Future) -> None:
+        with _mix_lock:
+            if _mix_futures.get(job_id) is done:
+                del _mix_futures[job_id]
 
-def _env_int(name: str, default: int) -> int:
-    raw = os.getenv(name)
-    if raw is None:
-        return default
-    try:
-        return int(raw)
-    except ValueError:
-        return default
+    future.add_done_callback(_forget)
+
+
+def _cancel_queued_mix(job_id: str) -> None:
+    with _mix_lock:
+        future = _mix_futures.get(job_id)
+    if future is not None:
+        future.cancel()
 
 
 def _mix_history_limit() -> int:
-    return max(1, _env_int("JOB_MIX_HISTORY_LIMIT", 10))
+    return max(1, settings.mix_history_limit)
 
 
 def _job_payload(job: Job) -> dict:
+    # Python-mode dump: datetimes, enums and numpy scalars are encoded by the job
+    # store's serializer (orjson) instead of being stringified by pydantic first.
     if hasattr(job, "model_dump"):
-        return job.model_dump(mode="json")
+        return job.model_dump()
     return job.dict()
 
 
-def _persist_job(job: Job) -> None:
+def _job_record(job: Job, history_changed: bool = True) -> tuple:
     payload = _job_payload(job)
-    path = _job_store_root / f"{job.id}.json"
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp_path = path.with_suffix(".json.tmp")
-    tmp_path.write_text(json.dumps(payload, ensure_ascii=True, default=_json_default))
-    tmp_path.replace(path)
+    history = (payload.get("mix_history") or []) if history_changed else None
+    return job.id, job.created_at.timestamp(), payload, history
+
+
+def _flush_dirty_jobs() -> None:
+    # Everything dirtied since the last flush goes to disk in one transaction.
+    with _persist_lock:
+        with _jobs_lock:
+            jobs = [_jobs[job_id] for job_id in _dirty_jobs if job_id in _jobs]
+            _dirty_jobs.clear()
+        job_store.save_jobs(_job_store_root, [_job_record(job) for job in jobs])
+
+
+def _flush_loop() -> None:
+    while True:
+        _flush_event.wait()
+        _flush_event.clear()
+        try:
+            _flush_dirty_jobs()
+        except Exception as exc:
+            logger.warning("Failed to flush job history: %s", exc)
+        time.sleep(_flush_interval_seconds)
+
+
+def _schedule_flush(job_id: str) -> None:
+    global _flush_thread
+    with _jobs_lock:
+        _dirty_jobs.add(job_id)
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(target=_flush_loop, name="job-flush", daemon=True)
+            _flush_thread.start()
+    _flush_event.set()
+
+
+def _pop_job(job_id: str) -> Job | None:
+    global _jobs
+    with _jobs_lock:
+        if job_id not in _jobs:
+            return None
+        jobs = dict(_jobs)
+        job = jobs.pop(job_id)
+        _jobs = jobs
+        _dirty_jobs.discard(job_id)
+    return job
+
+
+def _set_job(job: Job, persist: bool = True) -> None:
+    # persist=False keeps the update in memory and lets the flusher coalesce writes
+    # (at most one per second); terminal transitions are written immediately.
+    if not persist:
+        global _jobs
+        with _jobs_lock:
+            _jobs = {**_jobs, job.id: job}
+        _schedule_flush(job.id)
+        return
+    _set_jobs([job])
 
 
-def _set_job(job: Job) -> None:
+def _set_jobs(jobs: list[Job]) -> None:
+    # Publish a batch of updates with one snapshot swap and one store transaction.
+    global _jobs
+    if not jobs:
+        return
     with _jobs_lock:
-        _jobs[job.id] = job
-    _persist_job(job)
+        previous = _jobs
+        _jobs = {**previous, **{job.id: job for job in jobs}}
+        _dirty_jobs.difference_update(job.id for job in jobs)
+    records = []
+    for job in jobs:
+        # job.copy() shares the history list, so identity tells us whether it changed.
+        before = previous.get(job.id)
+        history_changed = before is None or before.mix_history is not job.mix_history
+        records.append(_job_record(job, history_changed))
+    with _persist_lock:
+        job_store.save_jobs(_job_store_root, records)
+
+
+def _save_upload(file: UploadFile, path: Path) -> None:
+    try:
+        with path.open("wb") as out:
+            shutil.copyfileobj(file.file, out, length=_upload_chunk_bytes)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
 
 
-def _hydrate_job_files(job_id: str) -> None:
+def _list_upload_dirs() -> set[str]:
+    try:
+        with os.scandir(_upload_root) as entries:
+            return {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
+        return set()
+
+
+def _hydrate_job_files(job_id: str, upload_dirs: set[str] | None = None) -> None:
+    if upload_dirs is not None and job_id not in upload_dirs:
+        return
     upload_dir = _upload_root / job_id
-    wav_path = upload_dir / "input.wav"
-    if not wav_path.exists():
+    wav_path = None
+    input_path = None
+    try:
+        with os.scandir(upload_dir) as entries:
+            for entry in entries:
+                if entry.name == "input.wav":
+                    wav_path = Path(entry.path)
+                elif input_path is None and entry.name.startswith("input."):
+                    input_path = Path(entry.path)
+    except FileNotFoundError:
+        return
+    if wav_path is None:
         return
-    input_path = wav_path
-    for candidate in upload_dir.glob("input.*"):
-        if candidate.name != "input.wav":
-            input_path = candidate
-            break
     _job_files[job_id] = {
-        "input": input_path,
+        "input": input_path or wav_path,
         "wav": wav_path,
         "output": _output_root / job_id / "output.wav",
     }
 
 
+def _import_legacy_job_files() -> None:
+    # Older versions kept one <job_id>.json per job; move them into the database once.
+    with os.scandir(_job_store_root) as entries:
+        paths = sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        )
+    records = []
+    imported: list[Path] = []
+    for path in paths:
+        try:
+            # Validate straight from the raw bytes: no str decode or dict round trip.
+            job = Job.model_validate_json(path.read_bytes())
+        except Exception as exc:
+            logger.warning("Failed to import job history %s: %s", path.name, exc)
+            continue
+        records.append(_job_record(job))
+        imported.append(path)
+    job_store.save_jobs(_job_store_root, records)
+    for path in imported:
+        path.unlink()
+
+
 def _load_jobs_from_disk() -> None:
+    global _jobs
     if not _job_store_root.exists():
         return
-    for path in sorted(_job_store_root.glob("*.json")):
+    _import_legacy_job_files()
+    jobs: dict[str, Job] = {}
+    upload_dirs = _list_upload_dirs()
+    for payload in job_store.load_jobs(_job_store_root):
         try:
-            payload = json.loads(path.read_text())
             job = Job(**payload)
         except Exception as exc:
-            logger.warning("Failed to load job history %s: %s", path.name, exc)
+            logger.warning("Failed to load job history %s: %s", payload.get("id"), exc)
             continue
-        with _jobs_lock:
-            _jobs[job.id] = job
-        _hydrate_job_files(job.id)
+        jobs[job.id] = job
+        _hydrate_job_files(job.id, upload_dirs)
+    with _jobs_lock:
+        _jobs = {**_jobs, **jobs}
 
 
-def _purge_job_files(job_id: str) -> None:
-    upload_dir = _upload_root / job_id
-    output_dir = _output_root / job_id
-    if upload_dir.exists():
-        shutil.rmtree(upload_dir, ignore_errors=True)
-    if output_dir.exists():
-        shutil.rmtree(output_dir, ignore_errors=True)
+def _move_to_trash(path: Path) -> Path | None:
+    # Deleting multi-GB output trees is slow, so requests only rename the directory
+    # out of the way (atomic, O(1)) and the actual delete runs in the background.
+    trash = path.with_name(f".{path.name}{_trash_marker}{uuid.uuid4().hex}")
+    try:
+        os.replace(path, trash)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return path
+    return trash
 
 
-def _purge_output_dir(job_id: str) -> bool:
-    output_dir = _output_root / job_id
-    if output_dir.exists():
-        shutil.rmtree(output_dir, ignore_errors=True)
-        return True
-    return False
+def _unlink_quiet(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _remove_tree(path: Path) -> None:
+    files: list[str] = []
+    dirs: list[str] = []
+    for root, dirnames, filenames in os.walk(path, topdown=False):
+        files.extend(os.path.join(root, name) for name in filenames)
+        files.extend(
+            os.path.join(root, name)
+            for name in dirnames
+            if os.path.islink(os.path.join(root, name))
+        )
+        dirs.append(root)
+    # unlink releases the GIL, so a few threads overlap the filesystem round trips.
+    try:
+        with ThreadPoolExecutor(max_workers=_purge_workers) as pool:
+            list(pool.map(_unlink_quiet, files))
+    except RuntimeError:
+        # Interpreter is shutting down; _sweep_trash finishes the job next startup.
+        return
+    for directory in dirs:
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+
+def _remove_trees(paths: list[Path]) -> None:
+    for path in paths:
+        try:
+            _remove_tree(path)
+        except Exception as exc:
+            logger.warning("Failed to purge %s: %s", path, exc)
+
+
+def _purge_in_background(paths: list[Path]) -> None:
+    if not paths:
+        return
+    threading.Thread(target=_remove_trees, args=(paths,), name="job-purge", daemon=True).start()
+
+
+def _purge_job_files(job_id: str) -> list[Path]:
+    trash = [_move_to_trash(_upload_root / job_id), _move_to_trash(_output_root / job_id)]
+    return [path for path in trash if path is not None]
+
+
+def _purge_output_dir(job_id: str) -> Path | None:
+    return _move_to_trash(_output_root / job_id)
+
+
+def _sweep_trash() -> None:
+    # Trash left behind by a process that exited mid-delete.
+    leftovers: list[Path] = []
+    for root in (_upload_root, _output_root, _cache_root.parent):
+        if root.exists():
+            leftovers.extend(root.glob(f".*{_trash_marker}*"))
+    _purge_in_background(leftovers)
 
 
 def _append_mix_history(job: Job, summary: JobMixSummary) -> Job:
@@ -143,13 +356,18 @@ def _append_mix_history(job: Job, summary: JobMixSummary) -> Job:
 
 
 def _get_mix_state(job_id: str) -> MixResponse | None:
-    with _mix_lock:
-        return _mix_states.get(job_id)
+    return _mix_states.get(job_id)
 
 
 def _get_mix_token(job_id: str) -> str | None:
+    return _mix_tokens.get(job_id)
+
+
+def _drop_mix_state(job_id: str) -> None:
+    global _mix_states, _mix_tokens
     with _mix_lock:
-        return _mix_tokens.get(job_id)
+        _mix_tokens = {key: value for key, value in _mix_tokens.items() if key != job_id}
+        _mix_states = {key: value for key, value in _mix_states.items() if key != job_id}
 
 
 def _set_mix_state(
@@ -164,7 +382,8 @@ def _set_mix_state(
     chunks_total: int | None = None,
     eta_seconds: float | None = None,
 ) -> MixResponse:
-    state = MixResponse(
+    # Arguments are already typed by the signature; skip validation on every progress tick.
+    state = MixResponse.model_construct(
         job_id=job_id,
         status=status,
         output_url=output_url,
@@ -175,10 +394,12 @@ def _set_mix_state(
         chunks_total=chunks_total,
         eta_seconds=eta_seconds,
     )
+    global _mix_states, _mix_tokens
     with _mix_lock:
-        _mix_states[job_id] = state
+        # Publish the token before the state; _should_finalize reads them in reverse.
         if token is not None:
-            _mix_tokens[job_id] = token
+            _mix_tokens = {**_mix_tokens, job_id: token}
+        _mix_states = {**_mix_states, job_id: state}
     return state
 
 
@@ -209,13 +430,10 @@ def _update_mix_progress(
 
 
 def _should_finalize(job_id: str, token: str) -> bool:
-    with _mix_lock:
-        state = _mix_states.get(job_id)
-        return (
-            state is not None
-            and state.status == JobStatus.RUNNING
-            and _mix_tokens.get(job_id) == token
-        )
+    state = _mix_states.get(job_id)
+    return (
+        state is not None and state.status == JobStatus.RUNNING and _mix_tokens.get(job_id) == token
+    )
 
 
 def _latest_output_file(job_id: str) -> Path | None:
@@ -232,6 +450,22 @@ def _latest_output_file(job_id: str) -> Path | None:
     return max(candidates, key=lambda path: path.stat().st_mtime)
 
 
+def _analyze_upload(
+    job_id: str, input_path: Path, wav_path: Path, top_n: int, use_yamnet: bool
+) -> tuple[list[dict], float | None]:
+    audio, sr = audio_io.extract_audio(
+        input_path, wav_path, target_sr=DEFAULT_SAMPLE_RATE, mono=True
+    )
+    logger.info("Job audio extracted job=%s samples=%d sr=%d", job_id, audio.shape[0], sr)
+    candidates = tasks.build_candidates(audio, sr, top_n=top_n, use_yamnet=use_yamnet)
+    logger.info("Job candidates built job=%s count=%d", job_id, len(candidates))
+    duration_seconds = audio.shape[0] / float(sr) if sr else None
+    return candidates, duration_seconds
+
+
+# create_job has to be async to await the multipart upload, so every blocking step
+# (copying the upload, decoding, candidate detection) is pushed to the threadpool.
+# All other file-touching handlers are plain `def` and run there already.
 @router.post("/", response_model=Job)
 @router.post("", response_model=Job, include_in_schema=False)
 async def create_job(
@@ -251,20 +485,15 @@ async def create_job(
     job_dir = _upload_root / job_id
     job_dir.mkdir(parents=True, exist_ok=True)
     input_path = job_dir / f"input{suffix}"
-    input_path.write_bytes(await file.read())
-    await file.close()
+    await run_in_threadpool(_save_upload, file, input_path)
 
     wav_path = job_dir / "input.wav"
     output_path = _output_root / job_id / "output.wav"
     try:
         logger.info("Job upload received job=%s file=%s", job_id, original_name)
-        audio_io.extract_audio(input_path, wav_path, target_sr=DEFAULT_SAMPLE_RATE, mono=True)
-        logger.info("Job audio extracted job=%s", job_id)
-        audio, sr = audio_io.read_audio(wav_path, target_sr=DEFAULT_SAMPLE_RATE, mono=True)
-        logger.info("Job audio loaded job=%s samples=%d sr=%d", job_id, audio.shape[0], sr)
-        candidates = tasks.build_candidates(audio, sr, top_n=top_n, use_yamnet=use_yamnet)
-        logger.info("Job candidates built job=%s count=%d", job_id, len(candidates))
-        duration_seconds = audio.shape[0] / float(sr) if sr else None
+        candidates, duration_seconds = await run_in_threadpool(
+            _analyze_upload, job_id, input_path, wav_path, top_n, use_yamnet
+        )
         job = Job(
             id=job_id,
             status=JobStatus.DONE,
@@ -301,9 +530,18 @@ def get_mix_status(job_id: str) -> MixResponse:
     state = _get_mix_state(job_id)
     if state is not None:
         return state
-    output_file = _latest_output_file(job_id)
-    if output_file is not None:
-        output_name = output_file.name
+    # After a restart there is no in-memory state; the persisted last_mix names the
+    # output, so only fall back to scanning the output dir when that is missing.
+    output_name = None
+    job = _jobs.get(job_id)
+    if job is not None and job.last_mix is not None:
+        if (_output_root / job_id / job.last_mix.output_name).is_file():
+            output_name = job.last_mix.output_name
+    if output_name is None:
+        output_file = _latest_output_file(job_id)
+        if output_file is not None:
+            output_name = output_file.name
+    if output_name is not None:
         output_url = f"/assets/{job_id}/output"
         if output_name != "output.wav":
             output_url = f"{output_url}?name={output_name}"
@@ -322,6 +560,7 @@ def cancel_mix(job_id: str) -> MixResponse:
         raise HTTPException(status_code=404, detail="mix not started")
     if state.status != JobStatus.RUNNING:
         return state
+    _cancel_queued_mix(job_id)
     job = _jobs.get(job_id)
     if job is not None:
         _set_job(
@@ -388,7 +627,7 @@ def mix_job(job_id: str, payload: MixRequest) -> MixResponse:
     output_path = _output_root / job_id / output_filename
 
     running = job.copy(update={"status": JobStatus.RUNNING, "updated_at": datetime.utcnow()})
-    _set_job(running)
+    _set_job(running, persist=False)
     _set_mix_state(job_id, JobStatus.RUNNING, token=mix_token, progress=0.0)
 
     def _run_mix() -> None:
@@ -527,7 +766,7 @@ def mix_job(job_id: str, payload: MixRequest) -> MixResponse:
                 token=mix_token,
             )
 
-    threading.Thread(target=_run_mix, name=f"mix-{job_id}", daemon=True).start()
+    _submit_mix(job_id, _run_mix)
     return _get_mix_state(job_id) or MixResponse(job_id=job_id, status=JobStatus.RUNNING)
 
 
@@ -542,54 +781,54 @@ def get_job(job_id: str) -> Job:
 @router.get("/", response_model=list[Job])
 @router.get("", response_model=list[Job], include_in_schema=False)
 def list_jobs() -> list[Job]:
-    with _jobs_lock:
-        jobs = list(_jobs.values())
-    return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+    jobs = _jobs
+    return sorted(jobs.values(), key=lambda job: job.created_at, reverse=True)
 
 
 @router.post("/cleanup")
 def cleanup_jobs(payload: CleanupRequest) -> dict[str, object]:
     removed_jobs: list[str] = []
+    trash: list[Path] = []
     cleared_outputs = 0
     cleared_cache = False
     keep_latest = payload.keep_latest
 
     if keep_latest is not None:
         keep_latest = max(0, keep_latest)
-        with _jobs_lock:
-            jobs = list(_jobs.values())
+        jobs = list(_jobs.values())
         jobs_sorted = sorted(jobs, key=lambda job: job.created_at, reverse=True)
         for job in jobs_sorted[keep_latest:]:
             removed_jobs.append(job.id)
-            with _jobs_lock:
-                _jobs.pop(job.id, None)
-            job_path = _job_store_root / f"{job.id}.json"
-            if job_path.exists():
-                job_path.unlink()
-            _job_files.pop(job.id, None)
-            _purge_job_files(job.id)
-            with _mix_lock:
-                _mix_states.pop(job.id, None)
-                _mix_tokens.pop(job.id, None)
+            _pop_job(job.id)
+        with _persist_lock:
+            job_store.delete_jobs(_job_store_root, removed_jobs)
+        for job_id in removed_jobs:
+            _job_files.pop(job_id, None)
+            trash.extend(_purge_job_files(job_id))
+            _drop_mix_state(job_id)
 
     if payload.clear_outputs:
-        with _jobs_lock:
-            jobs = list(_jobs.values())
+        jobs = list(_jobs.values())
+        updated_jobs: list[Job] = []
         for job in jobs:
-            if _purge_output_dir(job.id):
+            output_trash = _purge_output_dir(job.id)
+            if output_trash is not None:
+                trash.append(output_trash)
                 cleared_outputs += 1
             if job.last_mix or job.mix_history:
-                updated = job.copy(update={"last_mix": None, "mix_history": []})
-                _set_job(updated)
+                updated_jobs.append(job.copy(update={"last_mix": None, "mix_history": []}))
+        _set_jobs(updated_jobs)
 
     if payload.clear_cache:
-        if _cache_root.exists():
-            shutil.rmtree(_cache_root, ignore_errors=True)
+        cache_trash = _move_to_trash(_cache_root)
+        if cache_trash is not None:
+            trash.append(cache_trash)
         _cache_root.mkdir(parents=True, exist_ok=True)
+        audio_io.clear_cache()
         cleared_cache = True
 
-    with _jobs_lock:
-        remaining_jobs = len(_jobs)
+    _purge_in_background(trash)
+    remaining_jobs = len(_jobs)
     return {
         "removed_jobs": removed_jobs,
         "remaining_jobs": remaining_jobs,
@@ -600,19 +839,16 @@ def cleanup_jobs(payload: CleanupRequest) -> dict[str, object]:
 
 @router.delete("/{job_id}")
 def delete_job(job_id: str) -> dict[str, str]:
-    with _jobs_lock:
-        job = _jobs.pop(job_id, None)
-    job_path = _job_store_root / f"{job_id}.json"
-    if job is None and not job_path.exists():
+    job = _pop_job(job_id)
+    with _persist_lock:
+        stored = job_store.delete_job(_job_store_root, job_id)
+    if job is None and not stored:
         raise HTTPException(status_code=404, detail="job not found")
-    if job_path.exists():
-        job_path.unlink()
     _job_files.pop(job_id, None)
-    _purge_job_files(job_id)
-    with _mix_lock:
-        _mix_states.pop(job_id, None)
-        _mix_tokens.pop(job_id, None)
+    _purge_in_background(_purge_job_files(job_id))
+    _drop_mix_state(job_id)
     return {"id": job_id, "status": "deleted"}
 
 
 _load_jobs_from_disk()
+_sweep_trash()
@@ -3,13 +3,19 @@ from __future__ import annotations
 import argparse
 import math
 import shutil
+import struct
 import subprocess
 import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple
 
 import numpy as np
 
+from app.core.config import settings
+
 try:
     import soundfile as sf
 except ModuleNotFoundError as exc:  # pragma: no cover - exercised via dependency check
@@ -18,6 +24,17 @@ except ModuleNotFoundError as exc:  # pragma: no cover - exercised via dependenc
 else:  # pragma: no cover - just a marker
     _SOUND_FILE_ERROR = None
 
+try:
+    import soxr
+except ModuleNotFoundError:  # pragma: no cover - scipy polyphase fallback below
+    soxr = None
+
+try:
+    from scipy.signal import firwin, resample_poly
+except ModuleNotFoundError:  # pragma: no cover - linear fallback below
+    firwin = None
+    resample_poly = None
+
 
 def dependencies_ok() -> bool:
     return sf is not None
@@ -30,24 +47,266 @@ def _require_lib(name: str, lib, err: Exception | None) -> None:
         ) from err
 
 
+# Frames per scratch block when downmixing multichannel files on read.
+_READ_BLOCK_FRAMES = 1 << 16
+
+_decoded_cache: OrderedDict[tuple, Tuple[np.ndarray, int]] = OrderedDict()
+_decoded_cache_bytes = 0
+_decoded_cache_lock = threading.Lock()
+
+
+def clear_cache() -> None:
+    global _decoded_cache_bytes
+    with _decoded_cache_lock:
+        _decoded_cache.clear()
+        _decoded_cache_bytes = 0
+
+
+def _cache_get(key: tuple) -> Tuple[np.ndarray, int] | None:
+    with _decoded_cache_lock:
+        entry = _decoded_cache.get(key)
+        if entry is not None:
+            _decoded_cache.move_to_end(key)
+        return entry
+
+
+def _cache_put(key: tuple, audio: np.ndarray, sr: int) -> None:
+    global _decoded_cache_bytes
+    limit = settings.audio_cache_mb * 1024 * 1024
+    if audio.nbytes > limit:
+        return
+    with _decoded_cache_lock:
+        previous = _decoded_cache.pop(key, None)
+        if previous is not None:
+            _decoded_cache_bytes -= previous[0].nbytes
+        _decoded_cache[key] = (audio, sr)
+        _decoded_cache_bytes += audio.nbytes
+        while _decoded_cache_bytes > limit:
+            _, (evicted, _) = _decoded_cache.popitem(last=False)
+            _decoded_cache_bytes -= evicted.nbytes
+
+
+def _downmix(audio: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    # Stay in float32; np.mean would accumulate through a float64 temporary.
+    if audio.shape[1] == 2:
+        mixed = np.add(audio[:, 0], audio[:, 1], out=out)
+        mixed *= np.float32(0.5)
+        return mixed
+    mixed = np.add.reduce(audio, axis=1, dtype=np.float32, out=out)
+    mixed *= np.float32(1.0 / audio.shape[1])
+    return mixed
+
+
+def _read_frames(handle: "sf.SoundFile", frames: int, mono: bool) -> np.ndarray:
+    # Decode straight into a preallocated float32 buffer. Downmixed reads go
+    # through a block-sized scratch buffer, so every channel of the whole file is
+    # never held at once.
+    channels = handle.channels
+    if not mono or channels == 1:
+        shape = frames if channels == 1 else (frames, channels)
+        return handle.read(frames, out=np.empty(shape, dtype=np.float32))
+    out = np.empty(frames, dtype=np.float32)
+    scratch = np.empty((min(frames, _READ_BLOCK_FRAMES), channels), dtype=np.float32)
+    pos = 0
+    while pos < frames:
+        block = handle.read(min(frames - pos, scratch.shape[0]), out=scratch)
+        if not block.shape[0]:
+            break
+        _downmix(block, out=out[pos : pos + block.shape[0]])
+        pos += block.shape[0]
+    return out[:pos]
+
+
+def _decode_audio(path: str | Path, target_sr: int | None, mono: bool) -> Tuple[np.ndarray, int]:
+    with sf.SoundFile(str(path)) as handle:
+        sr = handle.samplerate
+        audio = _read_frames(handle, handle.frames, mono)
+    if target_sr is not None and sr != target_sr:
+        audio = resample_audio(audio, sr, target_sr)
+        sr = target_sr
+    return audio, sr
+
+
 def read_audio(
     path: str | Path, target_sr: int | None = None, mono: bool = True
+) -> Tuple[np.ndarray, int]:
+    # Decoded audio is cached by (path, mtime, size) and returned read-only, so
+    # repeated previews/mixes of the same upload skip the decode.
+    _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+    stat = Path(path).stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size, target_sr, mono)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    audio, sr = _decode_audio(path, target_sr, mono)
+    audio.setflags(write=False)
+    _cache_put(key, audio, sr)
+    return audio, sr
+
+
+def read_audio_window(
+    path: str | Path,
+    t0: float,
+    t1: float,
+    target_sr: int | None = None,
+    mono: bool = True,
 ) -> Tuple[np.ndarray, int]:
     _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
-    audio, sr = sf.read(str(path), always_2d=False)
-    audio = audio.astype(np.float32, copy=False)
-    if mono and audio.ndim == 2:
-        audio = np.mean(audio, axis=1)
+    with sf.SoundFile(str(path)) as handle:
+        sr = handle.samplerate
+        start = min(handle.frames, max(0, int(math.floor(t0 * sr))))
+        end = min(handle.frames, max(start, int(math.ceil(t1 * sr))))
+        handle.seek(start)
+        audio = _read_frames(handle, end - start, mono)
     if target_sr is not None and sr != target_sr:
         audio = resample_audio(audio, sr, target_sr)
         sr = target_sr
     return audio, sr
 
 
-def write_audio(path: str | Path, audio: np.ndarray, sr: int) -> None:
+def read_audio_frames(path: str | Path, start: int, end: int, mono: bool = True) -> np.ndarray:
     _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
-    audio = audio.astype(np.float32, copy=False)
-    sf.write(str(path), audio, sr)
+    with sf.SoundFile(str(path)) as handle:
+        start = min(handle.frames, max(0, start))
+        end = min(handle.frames, max(start, end))
+        handle.seek(start)
+        return _read_frames(handle, end - start, mono)
+
+
+class AudioFrames:
+    # Read-only, array-like view of an audio file: exposes shape/len and reads
+    # [start:end] slices from disk on demand, so chunked separation only holds one
+    # chunk of input in memory. Each slice opens its own handle (thread-safe).
+    def __init__(self, path: str | Path, mono: bool = True) -> None:
+        _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+        info = sf.info(str(path))
+        self.path = Path(path)
+        self.sr = info.samplerate
+        self.mono = mono
+        self.shape = (info.frames,) if mono or info.channels == 1 else (info.frames, info.channels)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key: slice) -> np.ndarray:
+        if not isinstance(key, slice):
+            raise TypeError("AudioFrames only supports slicing")
+        start, end, step = key.indices(self.shape[0])
+        if step != 1:
+            raise ValueError("AudioFrames slices must be contiguous")
+        return read_audio_frames(self.path, start, end, mono=self.mono)
+
+
+def open_audio_frames(
+    path: str | Path, target_sr: int | None = None, mono: bool = True
+) -> AudioFrames | None:
+    # Only files already at target_sr can be streamed; resampling per chunk
+    # would leave filter edge artifacts at every chunk boundary.
+    frames = AudioFrames(path, mono=mono)
+    if target_sr is not None and frames.sr != target_sr:
+        return None
+    return frames
+
+
+def audio_duration(path: str | Path) -> float:
+    _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+    info = sf.info(str(path))
+    return info.frames / float(info.samplerate) if info.samplerate else 0.0
+
+
+def _quantize_pcm16(audio: np.ndarray) -> np.ndarray:
+    # Round onto the 1/32768 grid PCM_16 is read back on, in NumPy, so the stored
+    # samples don't depend on libsndfile's float->short conversion.
+    pcm = np.multiply(audio, np.float32(32768.0), dtype=np.float32)
+    np.rint(pcm, out=pcm)
+    np.clip(pcm, -32768.0, 32767.0, out=pcm)
+    return pcm.astype(np.int16)
+
+
+def write_audio(path: str | Path, audio: np.ndarray, sr: int, subtype: str = "FLOAT") -> None:
+    _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+    if audio.dtype != np.float32:
+        audio = audio.astype(np.float32)
+    # Store float samples as-is by default instead of letting soundfile quantize
+    # to PCM_16; callers pass subtype for compact intermediates.
+    if subtype == "PCM_16":
+        audio = _quantize_pcm16(audio)
+    sf.write(str(path), audio, sr, subtype=subtype)
+
+
+def open_writer(
+    path: str | Path, sr: int, channels: int = 1, subtype: str = "FLOAT"
+) -> "sf.SoundFile":
+    # Streaming WAV writer: callers append chunks with writer.write() and close it
+    # (or use it as a context manager) instead of holding the full mix in memory.
+    _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+    return sf.SoundFile(
+        str(path),
+        mode="w",
+        samplerate=sr,
+        channels=channels,
+        subtype=subtype,
+        format="WAV",
+    )
+
+
+_WAVE_FORMAT_IEEE_FLOAT = 3
+_FLOAT_WAV_HEADER_BYTES = 56
+
+
+def create_float_wav(path: str | Path, frames: int, sr: int, channels: int = 1) -> np.memmap:
+    # Preallocate a 32-bit float WAV and return its sample data as a writable
+    # memmap, so callers can fill and rescale the output in place. Raises
+    # ValueError when the data does not fit a RIFF (4 GiB) file.
+    data_bytes = frames * channels * 4
+    if data_bytes + _FLOAT_WAV_HEADER_BYTES - 8 > 0xFFFFFFFF:
+        raise ValueError("float WAV too large for RIFF")
+    header = b"".join(
+        (
+            b"RIFF",
+            struct.pack("<I", data_bytes + _FLOAT_WAV_HEADER_BYTES - 8),
+            b"WAVE",
+            b"fmt ",
+            struct.pack(
+                "<IHHIIHH",
+                16,
+                _WAVE_FORMAT_IEEE_FLOAT,
+                channels,
+                sr,
+                sr * channels * 4,
+                channels * 4,
+                32,
+            ),
+            b"fact",
+            struct.pack("<II", 4, frames),
+            b"data",
+            struct.pack("<I", data_bytes),
+        )
+    )
+    with open(path, "wb") as handle:
+        handle.write(header)
+        handle.truncate(len(header) + data_bytes)
+    shape = (frames,) if channels == 1 else (frames, channels)
+    if not frames:
+        return np.zeros(shape, dtype=np.float32)
+    return np.memmap(path, dtype="<f4", mode="r+", offset=len(header), shape=shape)
+
+
+def iter_audio_blocks(path: str | Path, blocksize: int):
+    _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+    with sf.SoundFile(str(path)) as handle:
+        yield from handle.blocks(blocksize=blocksize, dtype="float32", always_2d=False)
+
+
+@lru_cache(maxsize=32)
+def _polyphase_filter(orig_sr: int, target_sr: int) -> tuple[int, int, np.ndarray]:
+    factor = math.gcd(orig_sr, target_sr)
+    up = target_sr // factor
+    down = orig_sr // factor
+    # Same Kaiser low-pass resample_poly designs by default, built once per rate pair.
+    max_rate = max(up, down)
+    taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+    return up, down, taps.astype(np.float32)
 
 
 def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
@@ -55,6 +314,14 @@ def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarra
         return audio
     if audio.size == 0:
         return audio.astype(np.float32, copy=False)
+    if soxr is not None:
+        # libsoxr's SIMD polyphase resampler takes float32 as-is.
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        return soxr.resample(audio, orig_sr, target_sr, quality="HQ")
+    if resample_poly is not None:
+        up, down, taps = _polyphase_filter(int(orig_sr), int(target_sr))
+        audio = audio.astype(np.float32, copy=False)
+        return resample_poly(audio, up, down, axis=0, window=taps).astype(np.float32, copy=False)
     duration = audio.shape[0] / float(orig_sr)
     target_len = max(1, int(round(duration * target_sr)))
     x_old = np.linspace(0.0, duration, num=audio.shape[0], endpoint=False)
@@ -63,6 +330,8 @@ def resample_audio(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarra
 
 
 def slice_audio(audio: np.ndarray, sr: int, t0: float, t1: float) -> np.ndarray:
+    # Returns a view, not a copy: callers that mutate the clip must copy it first
+    # (slices of cached read_audio results are read-only anyway).
     start = max(0, int(math.floor(t0 * sr)))
     end = max(start, int(math.ceil(t1 * sr)))
     return audio[start:end]
@@ -72,33 +341,58 @@ def ffmpeg_available() -> bool:
     return shutil.which("ffmpeg") is not None
 
 
-def extract_audio(
-    input_path: str | Path, output_path: str | Path, target_sr: int, mono: bool = True
-) -> None:
+def decode_to_array(
+    input_path: str | Path, target_sr: int, mono: bool = True
+) -> Tuple[np.ndarray, int]:
     input_path = Path(input_path)
-    output_path = Path(output_path)
     if input_path.suffix.lower() == ".wav":
-        audio, sr = read_audio(input_path, target_sr=target_sr, mono=mono)
-        write_audio(output_path, audio, sr)
-        return
+        return read_audio(input_path, target_sr=target_sr, mono=mono)
     if not ffmpeg_available():
         raise RuntimeError("ffmpeg not found; install it to convert non-wav inputs.")
-    channels = "1" if mono else "2"
+    channels = 1 if mono else 2
     cmd = [
         "ffmpeg",
-        "-y",
+        "-nostdin",
         "-i",
         str(input_path),
         "-vn",
         "-ac",
-        channels,
+        str(channels),
         "-ar",
         str(target_sr),
         "-f",
-        "wav",
-        str(output_path),
+        "f32le",
+        "-",
     ]
-    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    proc = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    audio = np.frombuffer(proc.stdout, dtype=np.float32)
+    if channels > 1:
+        audio = audio.reshape(-1, channels)
+    return audio, target_sr
+
+
+def extract_audio(
+    input_path: str | Path, output_path: str | Path, target_sr: int, mono: bool = True
+) -> Tuple[np.ndarray, int]:
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    if input_path.suffix.lower() == ".wav" and _wav_matches(input_path, target_sr, mono):
+        # Already in the target layout: copy (or keep) the file instead of
+        # decoding and re-encoding it.
+        if input_path.resolve() != output_path.resolve():
+            shutil.copyfile(input_path, output_path)
+        return read_audio(output_path, target_sr=target_sr, mono=mono)
+    audio, sr = decode_to_array(input_path, target_sr=target_sr, mono=mono)
+    write_audio(output_path, audio, sr)
+    return audio, sr
+
+
+def _wav_matches(path: Path, target_sr: int, mono: bool) -> bool:
+    _require_lib("soundfile", sf, _SOUND_FILE_ERROR)
+    info = sf.info(str(path))
+    return (
+        info.format == "WAV" and info.samplerate == target_sr and (info.channels == 1 or not mono)
+    )
 
 
 def _selftest() -> None:
@@ -18,7 +18,12 @@ DEFAULT_SAMPLE_RATE = 16000
 class Settings:
     candidate_top_n: int = int(os.getenv("CANDIDATE_TOP_N", "12"))
     preview_seconds: int = int(os.getenv("PREVIEW_SECONDS", "10"))
+    mix_history_limit: int = int(os.getenv("JOB_MIX_HISTORY_LIMIT", "10"))
     model_sam_audio_id: str = os.getenv("MODEL_SAM_AUDIO_ID", "facebook/sam-audio-small")
+    audio_cache_mb: int = int(os.getenv("AUDIO_CACHE_MB", "512"))
+    api_threadpool_size: int = int(os.getenv("API_THREADPOOL_SIZE", "100"))
+    # <= 0 = one less than the CPU count.
+    mix_workers: int = int(os.getenv("MIX_WORKERS", "0"))
 
 
 settings = Settings()
@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Tuple
 
 
+# Plain substring checks on purpose: each `in` is a C-level scan, which beats a
+# keyword regex here since re has no multi-literal (Aho-Corasick) fast path.
 def classify_error(exc: Exception) -> Tuple[str, str]:
     message = str(exc).strip()
     lowered = message.lower()
@@ -2,21 +2,156 @@ from __future__ import annotations
 
 import hashlib
 import json
+import mmap
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+try:
+    from blake3 import blake3
+except ModuleNotFoundError:  # pragma: no cover - sha256 fallback below
+    blake3 = None
+
+HASH_INDEX_NAME = "hash-index.json"
+
+# Most recently used (path -> (mtime_ns, size, digest)) entries, oldest first.
+_HASH_INDEX_MAX_ENTRIES = 4096
+_hash_index: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+_loaded_indexes: set[Path] = set()
+_hash_index_lock = threading.Lock()
+
+
+def _new_hasher():
+    # Cache keys only need to be stable, not adversarially collision resistant, so
+    # prefer multi-threaded SIMD BLAKE3; both produce 64 hex chars.
+    if blake3 is not None:
+        return blake3(max_threads=blake3.AUTO)
+    return hashlib.sha256()
+
+
+def _digest(data) -> str:
+    hasher = _new_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
 
 def hash_file(path: str | Path) -> str:
-    digest = hashlib.sha256()
+    # Hash the whole mapped file in one call (no per-MiB Python loop).
     with open(path, "rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+        try:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _digest(mapped)
+        except (ValueError, OSError):
+            # Empty or unmappable files.
+            handle.seek(0)
+            return hashlib.file_digest(handle, _new_hasher).hexdigest()
 
 
-def fingerprint_settings(settings: dict[str, Any]) -> str:
+def hash_algorithm() -> str:
+    # Name of the digest hash_file produces; part of cache keys so switching
+    # between blake3 and sha256 never mixes entries.
+    return "blake3" if blake3 is not None else "sha256"
+
+
+def _read_hash_index(index_path: Path) -> dict[str, tuple[int, int, str]]:
+    try:
+        raw = json.loads(index_path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(raw, dict) or raw.get("algorithm") != hash_algorithm():
+        return {}
+    entries = raw.get("entries")
+    if not isinstance(entries, dict):
+        return {}
+    return {
+        key: (int(value[0]), int(value[1]), str(value[2]))
+        for key, value in entries.items()
+        if isinstance(value, list) and len(value) == 3
+    }
+
+
+def _write_hash_index(index_path: Path) -> None:
+    payload = {
+        "algorithm": hash_algorithm(),
+        "entries": {key: list(value) for key, value in _hash_index.items()},
+    }
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f".{index_path.name}.{uuid.uuid4().hex}")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, index_path)
+
+
+def hash_file_cached(path: str | Path, cache_dir: str | Path | None = None) -> str:
+    # Reuse the digest while the file's (mtime_ns, size) is unchanged; persisted to
+    # cache_dir/hash-index.json so reruns across restarts skip the full read.
+    key = str(Path(path).resolve())
+    stat = os.stat(key)
+    index_path = Path(cache_dir) / HASH_INDEX_NAME if cache_dir is not None else None
+    with _hash_index_lock:
+        if index_path is not None and index_path not in _loaded_indexes:
+            for entry_key, entry in _read_hash_index(index_path).items():
+                _hash_index.setdefault(entry_key, entry)
+            _loaded_indexes.add(index_path)
+        entry = _hash_index.get(key)
+        if entry is not None:
+            _hash_index.move_to_end(key)
+    if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+        return entry[2]
+    digest = hash_file(key)
+    with _hash_index_lock:
+        _hash_index[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        _hash_index.move_to_end(key)
+        while len(_hash_index) > _HASH_INDEX_MAX_ENTRIES:
+            _hash_index.popitem(last=False)
+        if index_path is not None:
+            try:
+                _write_hash_index(index_path)
+            except OSError:
+                pass
+    return digest
+
+
+def _freeze(value: Any) -> Any:
+    # Hashable, type-tagged mirror of a JSON-like value (1, 1.0 and True must not
+    # share a cache entry since they serialize differently).
+    if isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: str(item[0]))
+        return (dict, tuple((key, _freeze(item)) for key, item in items))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze(item) for item in value))
+    return (type(value), value)
+
+
+def _thaw(frozen: Any) -> Any:
+    kind, value = frozen
+    if kind is dict:
+        return {key: _thaw(item) for key, item in value}
+    if kind is list:
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _fingerprint(settings: dict[str, Any]) -> str:
     payload = json.dumps(settings, sort_keys=True, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+    return _digest(payload)
+
+
+@lru_cache(maxsize=256)
+def _fingerprint_cached(frozen: tuple) -> str:
+    return _fingerprint(_thaw(frozen))
+
+
+def fingerprint_settings(settings: dict[str, Any]) -> str:
+    frozen = _freeze(settings)
+    try:
+        return _fingerprint_cached(frozen)
+    except TypeError:
+        # Unhashable leaf values; hash directly.
+        return _fingerprint(settings)
 
 
 def cache_key(audio_hash: str, settings_hash: str) -> str:
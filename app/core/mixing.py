@@ -2,30 +2,150 @@ from __future__ import annotations
 
 import numpy as np
 
+_KERNELS = None
+
 
 def apply_gain(audio: np.ndarray, gain: float) -> np.ndarray:
-    return audio * float(gain)
+    return audio * np.float32(gain)
 
 
 def mix_tracks(tracks: list[np.ndarray]) -> np.ndarray:
     if not tracks:
         return np.zeros(0, dtype=np.float32)
-    max_len = max(track.shape[0] for track in tracks)
-    mix = np.zeros(max_len, dtype=np.float32)
-    for track in tracks:
-        padded = np.zeros(max_len, dtype=np.float32)
-        padded[: track.shape[0]] = track.astype(np.float32, copy=False)
-        mix += padded
+    longest = max(range(len(tracks)), key=lambda idx: tracks[idx].shape[0])
+    # Seed the buffer with the longest track instead of zero-filling it first.
+    mix = np.empty(tracks[longest].shape[0], dtype=np.float32)
+    np.copyto(mix, tracks[longest], casting="same_kind")
+    for idx, track in enumerate(tracks):
+        if idx == longest:
+            continue
+        # Shorter tracks are implicitly zero-padded: add into the prefix in place.
+        length = track.shape[0]
+        np.add(mix[:length], track, out=mix[:length], casting="same_kind")
     return mix
 
 
+def _peak_abs_loop(x):
+    hi = 0.0
+    lo = 0.0
+    for i in range(x.shape[0]):
+        v = x[i]
+        if v > hi:
+            hi = v
+        elif v < lo:
+            lo = v
+    return max(hi, -lo)
+
+
+def _scale_clip_loop(x, scale, bound, out):
+    for i in range(x.shape[0]):
+        v = x[i] * scale
+        out[i] = bound if v > bound else (-bound if v < -bound else v)
+
+
+def _lazy_kernels():
+    # Optional numba versions of the loops above: one pass for the peak and one
+    # fused scale+clip pass. Compiled on first use; None when numba is missing.
+    global _KERNELS
+    if _KERNELS is None:
+        try:
+            from numba import njit
+        except ModuleNotFoundError:
+            _KERNELS = False
+        else:
+            jit = njit(cache=True, boundscheck=False)
+            _KERNELS = (jit(_peak_abs_loop), jit(_scale_clip_loop))
+    return _KERNELS or None
+
+
+def _flat_float32(audio: np.ndarray) -> np.ndarray | None:
+    if audio.dtype == np.float32 and audio.flags.c_contiguous:
+        return audio.reshape(-1)
+    return None
+
+
+def _scale_clip(
+    audio: np.ndarray, scale: float, bound: float, out: np.ndarray | None
+) -> np.ndarray | None:
+    # Kernel path for normalize_chain/limiter; None means use NumPy instead.
+    kernels = _lazy_kernels()
+    flat = _flat_float32(audio) if kernels else None
+    if flat is None:
+        return None
+    if out is None:
+        out = np.empty_like(audio)
+    flat_out = _flat_float32(out)
+    if flat_out is None or out.shape != audio.shape:
+        return None
+    kernels[1](flat, np.float32(scale), np.float32(bound), flat_out)
+    return out
+
+
+def peak_abs(audio: np.ndarray) -> float:
+    # max/min reductions avoid materializing np.abs(audio).
+    if not audio.size:
+        return 0.0
+    kernels = _lazy_kernels()
+    flat = _flat_float32(audio) if kernels else None
+    if flat is not None:
+        return float(kernels[0](flat))
+    return float(max(audio.max(), -audio.min()))
+
+
+def peak_scale(peak: float, target_peak: float = 0.95) -> float:
+    if peak == 0.0:
+        return 1.0
+    return min(1.0, target_peak / peak)
+
+
 def peak_normalize(audio: np.ndarray, target_peak: float = 0.95) -> np.ndarray:
-    peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+    peak = peak_abs(audio)
     if peak == 0.0:
         return audio
-    scale = min(1.0, target_peak / peak)
-    return audio * scale
+    return audio * np.float32(peak_scale(peak, target_peak))
+
+
+def limiter(
+    audio: np.ndarray, threshold: float = 0.99, out: np.ndarray | None = None
+) -> np.ndarray:
+    # Pass out=audio to clip in place when the caller owns the buffer.
+    bound = np.float32(threshold)
+    result = _scale_clip(audio, 1.0, bound, out)
+    if result is not None:
+        return result
+    return np.clip(audio, -bound, bound, out=out)
+
+
+def apply_gain_limit(
+    audio: np.ndarray,
+    gain: float,
+    threshold: float = 0.99,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    # limiter(apply_gain(audio, gain), threshold) without the intermediate array:
+    # one fused pass with the kernels, else a multiply then an in-place clip.
+    result = _scale_clip(audio, gain, threshold, out)
+    if result is not None:
+        return result
+    result = np.multiply(audio, np.float32(gain), out=out)
+    return limiter(result, threshold, out=result)
 
 
-def limiter(audio: np.ndarray, threshold: float = 0.99) -> np.ndarray:
-    return np.clip(audio, -threshold, threshold)
+def normalize_chain(
+    audio: np.ndarray,
+    gain: float = 1.0,
+    target_peak: float = 0.95,
+    threshold: float = 0.99,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    # limiter(peak_normalize(apply_gain(audio, gain))) with a single multiply: the
+    # peak scales with |gain|, and once the peak is at most target_peak the clip
+    # can only matter when target_peak exceeds the limiter threshold.
+    gain = float(gain)
+    scale = gain * peak_scale(peak_abs(audio) * abs(gain), target_peak)
+    if target_peak > threshold:
+        return apply_gain_limit(audio, scale, threshold, out=out)
+    result = _scale_clip(audio, scale, np.inf, out)
+    if result is not None:
+        return result
+    return np.multiply(audio, np.float32(scale), out=out)
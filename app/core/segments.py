@@ -4,6 +4,11 @@ from dataclasses import dataclass
 
 import numpy as np
 
+# Masks at least this long find run edges on a bit-packed copy.
+_PACKED_MIN_FRAMES = 4096
+# int8 padding keeps np.diff on the int8 mask view instead of promoting to int64.
+_ZERO = np.int8(0)
+
 
 @dataclass(frozen=True)
 class Segment:
@@ -19,6 +24,9 @@ def _frame_duration(times: np.ndarray) -> float:
     return float(np.median(diffs))
 
 
+SegmentArrays = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
 def segments_from_scores(
     times: np.ndarray,
     scores: np.ndarray,
@@ -26,41 +34,185 @@ def segments_from_scores(
     merge_gap: float = 0.2,
     min_duration: float = 0.0,
 ) -> list[Segment]:
+    return _to_segments(
+        segment_arrays_from_scores(
+            times, scores, threshold, merge_gap=merge_gap, min_duration=min_duration
+        )
+    )
+
+
+def segment_arrays_from_scores(
+    times: np.ndarray,
+    scores: np.ndarray,
+    threshold: float,
+    merge_gap: float = 0.2,
+    min_duration: float = 0.0,
+) -> SegmentArrays:
+    # Same result as segments_from_scores as parallel (starts, ends, scores) arrays.
     if times.size == 0:
-        return []
+        return _empty_arrays()
     active = scores >= threshold
     if not np.any(active):
-        return []
+        return _empty_arrays()
+    frame = _frame_duration(times)
+    starts, ends = _run_bounds(active)
+    return _arrays_from_runs(times, scores, starts, ends, frame, merge_gap, min_duration)
+
+
+def segments_from_scores_batched(
+    times: np.ndarray,
+    scores: np.ndarray,
+    threshold: float,
+    merge_gap: float = 0.2,
+    min_duration: float = 0.0,
+) -> list[list[Segment]]:
+    return [
+        _to_segments(arrays)
+        for arrays in segment_arrays_from_scores_batched(
+            times, scores, threshold, merge_gap=merge_gap, min_duration=min_duration
+        )
+    ]
+
+
+def segment_arrays_from_scores_batched(
+    times: np.ndarray,
+    scores: np.ndarray,
+    threshold: float,
+    merge_gap: float = 0.2,
+    min_duration: float = 0.0,
+) -> list[SegmentArrays]:
+    # scores is [T, K]: threshold every column in one pass, then only find runs
+    # per column.
+    if times.size == 0:
+        return [_empty_arrays() for _ in range(scores.shape[1])]
     frame = _frame_duration(times)
-    indices = np.flatnonzero(active)
-    segments: list[Segment] = []
-    start_idx = indices[0]
-    prev_idx = indices[0]
-    for idx in indices[1:]:
-        if idx != prev_idx + 1:
-            segment = _segment_from_range(times, scores, start_idx, prev_idx, frame)
-            segments.append(segment)
-            start_idx = idx
-        prev_idx = idx
-    segments.append(_segment_from_range(times, scores, start_idx, prev_idx, frame))
-    merged = merge_segments(segments, merge_gap=merge_gap)
+    active = scores >= threshold
+    has_active = active.any(axis=0)
+    edges = None
+    if active.shape[0] < _PACKED_MIN_FRAMES:
+        edges = np.diff(active.view(np.int8), axis=0, prepend=_ZERO, append=_ZERO)
+    results: list[SegmentArrays] = []
+    for col in range(scores.shape[1]):
+        if not has_active[col]:
+            results.append(_empty_arrays())
+            continue
+        if edges is not None:
+            starts, ends = _split_edges(np.flatnonzero(edges[:, col]))
+        else:
+            starts, ends = _run_bounds(active[:, col])
+        results.append(
+            _arrays_from_runs(times, scores[:, col], starts, ends, frame, merge_gap, min_duration)
+        )
+    return results
+
+
+def _empty_arrays() -> SegmentArrays:
+    empty = np.zeros(0, dtype=np.float64)
+    return empty, empty, empty
+
+
+def _to_segments(arrays: SegmentArrays) -> list[Segment]:
+    starts, ends, scores = arrays
+    return [
+        Segment(start=float(start), end=float(end), score=float(score))
+        for start, end, score in zip(starts, ends, scores)
+    ]
+
+
+def _run_bounds(active: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # First and last index of every run of True values.
+    if active.shape[0] >= _PACKED_MIN_FRAMES:
+        return _run_bounds_packed(active)
+    # Viewing the mask as int8 skips a cast copy; one flatnonzero finds both edges.
+    edges = np.diff(active.view(np.int8), prepend=_ZERO, append=_ZERO)
+    return _split_edges(np.flatnonzero(edges))
+
+
+def _split_edges(positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Runs start with the mask False, so edges alternate rising/falling.
+    return positions[0::2], positions[1::2] - 1
+
+
+def _run_bounds_packed(active: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Pack the mask 64 frames per word and XOR each word with itself shifted by one
+    # frame (carrying the previous word's top bit) to flag every run edge. Only the
+    # words that contain an edge are unpacked again.
+    total = active.shape[0] + 1  # trailing False closes a run ending at the last frame
+    padded = np.zeros(-(-total // 64) * 64, dtype=bool)
+    padded[: active.shape[0]] = active
+    words = np.packbits(padded, bitorder="little").view("<u8")
+    carry = np.zeros_like(words)
+    carry[1:] = words[:-1] >> np.uint64(63)
+    flips = words ^ ((words << np.uint64(1)) | carry)
+    hot = np.flatnonzero(flips)
+    bits = np.unpackbits(flips[hot].view(np.uint8), bitorder="little").reshape(-1, 64)
+    rows, cols = np.nonzero(bits)
+    return _split_edges(hot[rows] * 64 + cols)
+
+
+def _arrays_from_runs(
+    times: np.ndarray,
+    scores: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    frame: float,
+    merge_gap: float,
+    min_duration: float,
+) -> SegmentArrays:
+    # Each reduceat span runs from a run start up to the next run start; the extra
+    # frames it covers are inactive (below threshold) so they never win the max.
+    peaks = np.maximum.reduceat(scores, starts).astype(np.float64)
+    seg_starts = times[starts].astype(np.float64)
+    seg_ends = times[ends] + frame
+    seg_starts, seg_ends, peaks = merge_segment_arrays(seg_starts, seg_ends, peaks, merge_gap)
     if min_duration > 0:
-        merged = [seg for seg in merged if (seg.end - seg.start) >= min_duration]
-    return merged
+        keep = (seg_ends - seg_starts) >= min_duration
+        seg_starts, seg_ends, peaks = seg_starts[keep], seg_ends[keep], peaks[keep]
+    return seg_starts, seg_ends, peaks
 
 
-def _segment_from_range(
-    times: np.ndarray, scores: np.ndarray, start_idx: int, end_idx: int, frame: float
-) -> Segment:
-    start = float(times[start_idx])
-    end = float(times[end_idx] + frame)
-    score = float(np.max(scores[start_idx : end_idx + 1]))
-    return Segment(start=start, end=end, score=score)
+def merge_segment_arrays(
+    starts: np.ndarray, ends: np.ndarray, scores: np.ndarray, merge_gap: float = 0.2
+) -> SegmentArrays:
+    # Array form of merge_segments. With a non-negative gap a segment joins the
+    # current group when its start is within the gap of the running max end, so
+    # group boundaries come from one cumulative-max pass.
+    if starts.size == 0:
+        return starts, ends, scores
+    if merge_gap < 0:
+        merged = merge_segments(_to_segments((starts, ends, scores)), merge_gap=merge_gap)
+        return (
+            np.array([seg.start for seg in merged]),
+            np.array([seg.end for seg in merged]),
+            np.array([seg.score for seg in merged]),
+        )
+    order = np.argsort(starts, kind="stable")
+    starts, ends, scores = starts[order], ends[order], scores[order]
+    reach = np.maximum.accumulate(ends)
+    breaks = np.flatnonzero(starts[1:] - reach[:-1] > merge_gap) + 1
+    groups = np.concatenate(([0], breaks))
+    return (
+        starts[groups],
+        np.maximum.reduceat(ends, groups),
+        np.maximum.reduceat(scores, groups),
+    )
 
 
 def merge_segments(segments: list[Segment], merge_gap: float = 0.2) -> list[Segment]:
     if not segments:
         return []
+    if merge_gap >= 0:
+        count = len(segments)
+        return _to_segments(
+            merge_segment_arrays(
+                np.fromiter((seg.start for seg in segments), np.float64, count),
+                np.fromiter((seg.end for seg in segments), np.float64, count),
+                np.fromiter((seg.score for seg in segments), np.float64, count),
+                merge_gap,
+            )
+        )
+    # A negative gap can open a group inside an earlier segment, where the global
+    # running max end no longer matches the group's own end: merge sequentially.
     segments = sorted(segments, key=lambda seg: seg.start)
     merged: list[Segment] = [segments[0]]
     for seg in segments[1:]:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import contextlib
 import logging
 import os
 import sys
 import threading
 import time
 import types
+import warnings
+from functools import lru_cache
 
 import numpy as np
 
@@ -14,6 +17,7 @@ from app.core.audio_io import resample_audio
 logger = logging.getLogger("uvicorn.error")
 
 _TORCH = None
+_TORCHAUDIO = None
 _SAM_AUDIO_CLASS = None
 _SAM_AUDIO_PROCESSOR_CLASS = None
 _SAM_AUDIO_MODEL = None
@@ -65,12 +69,39 @@ def _lazy_import_torch():
         except ModuleNotFoundError:
             _TORCH = False
         else:
+            # from_numpy on read-only decode-cache arrays is intentional (never
+            # written through); a process-wide filter stays thread-safe.
+            warnings.filterwarnings(
+                "ignore", message="The given NumPy array is not writable", category=UserWarning
+            )
             _TORCH = torch
     if _TORCH is False:
         return None
     return _TORCH
 
 
+def _lazy_import_torchaudio():
+    global _TORCHAUDIO
+    if _TORCHAUDIO is None:
+        try:
+            import torchaudio
+        except ModuleNotFoundError:
+            _TORCHAUDIO = False
+        else:
+            _TORCHAUDIO = torchaudio
+    if _TORCHAUDIO is False:
+        return None
+    return _TORCHAUDIO
+
+
+@lru_cache(maxsize=8)
+def _device_resampler(orig_sr: int, target_sr: int, device: str):
+    # transforms.Resample precomputes its sinc kernel once; reuse it per rate pair.
+    torchaudio = _lazy_import_torchaudio()
+    resampler = torchaudio.transforms.Resample(orig_sr, target_sr, lowpass_filter_width=6)
+    return resampler.to(device)
+
+
 def _lazy_import_sam_audio():
     global _SAM_AUDIO_CLASS, _SAM_AUDIO_PROCESSOR_CLASS
     if _SAM_AUDIO_CLASS is None:
@@ -163,11 +194,27 @@ def _match_length(audio: np.ndarray, target_len: int) -> np.ndarray:
     if audio.shape[0] > target_len:
         return audio[:target_len]
     if audio.shape[0] < target_len:
-        pad = target_len - audio.shape[0]
-        return np.pad(audio, (0, pad), mode="constant")
+        out = np.zeros((target_len, *audio.shape[1:]), dtype=audio.dtype)
+        out[: audio.shape[0]] = audio
+        return out
     return audio
 
 
+def _tensors_to_numpy(torch, device: str, *tensors) -> list[np.ndarray]:
+    if device.startswith("cuda"):
+        # Queue every device->host copy into pinned buffers and synchronize once,
+        # instead of one blocking .cpu() transfer per tensor.
+        host = [
+            torch.empty(tuple(tensor.shape), dtype=torch.float32, pin_memory=True)
+            for tensor in tensors
+        ]
+        for buffer, tensor in zip(host, tensors):
+            buffer.copy_(tensor.detach(), non_blocking=True)
+        torch.cuda.synchronize()
+        return [buffer.numpy() for buffer in host]
+    return [tensor.detach().cpu().numpy().astype(np.float32, copy=False) for tensor in tensors]
+
+
 def _env_optional(name: str) -> str | None:
     raw = os.getenv(name)
     if raw is None:
@@ -277,10 +324,26 @@ def _log_separation_done(
     )
 
 
-def _inference_options() -> tuple[bool, int]:
+@lru_cache(maxsize=1)
+def _inference_options() -> tuple[bool, int, str]:
+    # Read once per process; call _inference_options.cache_clear() after changing env.
     predict_spans = _env_flag("SAM_AUDIO_PREDICT_SPANS", False)
     reranking_candidates = max(1, _env_int("SAM_AUDIO_RERANKING_CANDIDATES", 1))
-    return predict_spans, reranking_candidates
+    autocast = _env_str("SAM_AUDIO_AUTOCAST", "auto").lower()
+    return predict_spans, reranking_candidates, autocast
+
+
+def _autocast_dtype(torch, device: str, mode: str):
+    # SAM_AUDIO_AUTOCAST: auto (CUDA only), true (any device) or false.
+    if mode in {"0", "false", "no", "off"}:
+        return None
+    if device.startswith("cuda"):
+        return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    if mode == "auto":
+        return None
+    if device == "mps":
+        return torch.float16
+    return torch.bfloat16
 
 
 def _run_sam_audio_inference(
@@ -294,33 +357,53 @@ def _run_sam_audio_inference(
 ) -> tuple[np.ndarray, np.ndarray]:
     audio_np = np.ascontiguousarray(audio, dtype=np.float32)
     target_sr = int(getattr(processor, "audio_sampling_rate", sr))
-    if sr != target_sr:
+    resample_on_device = sr != target_sr and _lazy_import_torchaudio() is not None
+    if sr != target_sr and not resample_on_device:
         audio_np = resample_audio(audio_np, sr, target_sr)
-    waveform = torch.as_tensor(audio_np, dtype=torch.float32)
+    # from_numpy shares the buffer, read-only decode-cache arrays included: the
+    # processor only reads the waveform, and on-device resampling or .to(device)
+    # makes its own tensor anyway. Mono (the common case) needs no further copy.
+    waveform = torch.from_numpy(audio_np)
     if waveform.ndim == 1:
         waveform = waveform.unsqueeze(0)
     elif waveform.ndim == 2 and waveform.shape[0] > waveform.shape[1]:
-        waveform = waveform.transpose(0, 1)
+        waveform = waveform.transpose(0, 1).contiguous()
     if waveform.ndim != 2:
         raise RuntimeError(f"SAM-Audio expects 2D waveform, got shape={tuple(waveform.shape)}")
-    waveform = waveform.contiguous()
+    if resample_on_device:
+        # Resample on the model device; the processor still receives a CPU tensor.
+        with torch.inference_mode():
+            waveform = _device_resampler(sr, target_sr, device)(waveform.to(device)).cpu()
     batch = processor(descriptions=[prompt], audios=[waveform]).to(device)
-    predict_spans, reranking_candidates = _inference_options()
-    with torch.inference_mode():
+    predict_spans, reranking_candidates, autocast_mode = _inference_options()
+    autocast_dtype = _autocast_dtype(torch, device, autocast_mode)
+    # Only build torch.autocast when a dtype was chosen: older torch builds reject
+    # device_type="mps" even with enabled=False.
+    if autocast_dtype is None:
+        autocast = contextlib.nullcontext()
+    else:
+        autocast = torch.autocast(device_type=device.split(":")[0], dtype=autocast_dtype)
+    with torch.inference_mode(), autocast:
         result = model.separate(
             batch,
             predict_spans=predict_spans,
             reranking_candidates=reranking_candidates,
         )
-    target = result.target[0]
-    residual = result.residual[0]
+    # Outputs may be half precision under autocast; average channels in float32.
+    target = result.target[0].float()
+    residual = result.residual[0].float()
     if target.ndim > 1:
         target = target.mean(dim=0)
     if residual.ndim > 1:
         residual = residual.mean(dim=0)
-    target_np = target.detach().cpu().numpy().astype(np.float32, copy=False)
-    residual_np = residual.detach().cpu().numpy().astype(np.float32, copy=False)
-    if sr != target_sr:
+    if resample_on_device:
+        # Outputs are still on the device: resample there before the host copy.
+        with torch.inference_mode():
+            restore = _device_resampler(target_sr, sr, device)
+            target = restore(target)
+            residual = restore(residual)
+    target_np, residual_np = _tensors_to_numpy(torch, device, target, residual)
+    if sr != target_sr and not resample_on_device:
         target_np = resample_audio(target_np, target_sr, sr)
         residual_np = resample_audio(residual_np, target_sr, sr)
     target_np = _match_length(target_np, audio.shape[0])
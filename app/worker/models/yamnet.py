@@ -1,28 +1,37 @@
 from __future__ import annotations
 
 import csv
+import functools
 import os
 import urllib.request
 from pathlib import Path
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from app.core.audio_io import resample_audio
-from app.core.segments import segments_from_scores
+from app.core.mixing import peak_abs
+from app.core.segments import (
+    SegmentArrays,
+    segment_arrays_from_scores,
+    segment_arrays_from_scores_batched,
+)
 
 YAMNET_SAMPLE_RATE = 16000
 DEFAULT_FRAME_SECONDS = 0.96
 DEFAULT_HOP_SECONDS = 0.48
+DEFAULT_SILENCE_FLOOR_DB = -60.0
 YAMNET_HUB_URL = os.getenv("YAMNET_HUB_URL", "https://tfhub.dev/google/yamnet/1")
 YAMNET_CLASS_MAP_URL = os.getenv(
     "YAMNET_CLASS_MAP_URL",
     "https://raw.githubusercontent.com/tensorflow/models/master/research/audioset/yamnet/yamnet_class_map.csv",
 )
 
-_TF = None
-_HUB = None
+_NUMBA_MIN_SAMPLES = 1_000_000
+
 _MODEL = None
 _LABELS: list[str] | None = None
+_RMS_KERNEL = None
 
 
 def _ensure_tfhub_cache_dir() -> None:
@@ -44,31 +53,74 @@ def _ensure_tfhub_cache_dir() -> None:
     os.environ["TFHUB_CACHE_DIR"] = str(path)
 
 
+@functools.cache
 def _lazy_import_tf():
-    global _TF, _HUB
-    if _TF is None:
+    # Cache-dir setup and the tensorflow import happen exactly once per process.
+    try:
+        _ensure_tfhub_cache_dir()
+        import tensorflow as tf
+        import tensorflow_hub as hub
+    except ModuleNotFoundError:
+        return None, None
+    return tf, hub
+
+
+def _lazy_rms_kernel():
+    # Optional numba kernel for long inputs: one parallel pass over the frames with
+    # no intermediate view. Compiled on first use; None when numba is missing.
+    global _RMS_KERNEL
+    if _RMS_KERNEL is None:
         try:
-            _ensure_tfhub_cache_dir()
-            import tensorflow as tf
-            import tensorflow_hub as hub
+            from numba import njit, prange
         except ModuleNotFoundError:
-            _TF = False
-            _HUB = False
+            _RMS_KERNEL = False
         else:
-            _TF = tf
-            _HUB = hub
-    if _TF is False or _HUB is False:
-        return None, None
-    return _TF, _HUB
+
+            @njit(cache=True, fastmath=True, parallel=True)
+            def _rms_frames(audio, frame_len, hop_len, n_frames, out):
+                for i in prange(n_frames):
+                    base = i * hop_len
+                    total = 0.0
+                    for j in range(frame_len):
+                        sample = audio[base + j]
+                        total += sample * sample
+                    out[i] = np.sqrt(total / frame_len)
+
+            _RMS_KERNEL = _rms_frames
+    if _RMS_KERNEL is False:
+        return None
+    return _RMS_KERNEL
+
+
+def _rows_rms(frames: np.ndarray) -> np.ndarray:
+    # Row-wise dot product, then mean and sqrt in place on the one result array.
+    energy = np.einsum("ij,ij->i", frames, frames)
+    np.divide(energy, max(1, frames.shape[1]), out=energy)
+    return np.sqrt(energy, out=energy)
+
+
+def _frame_rms(audio: np.ndarray, frame_len: int, hop_len: int) -> np.ndarray:
+    if audio.shape[0] < frame_len:
+        # Shorter than one frame: a single (partial) frame over the whole clip.
+        return _rows_rms(audio[np.newaxis, :])
+    n_frames = (audio.shape[0] - frame_len) // hop_len + 1
+    kernel = _lazy_rms_kernel() if audio.shape[0] >= _NUMBA_MIN_SAMPLES else None
+    if kernel is not None:
+        out = np.empty(n_frames, dtype=np.float32)
+        kernel(np.ascontiguousarray(audio), frame_len, hop_len, n_frames, out)
+        return out
+    # Zero-copy view of every hop-th frame; RMS via a row-wise dot product.
+    return _rows_rms(sliding_window_view(audio, frame_len)[::hop_len])
 
 
 def _load_model():
     global _MODEL
+    if _MODEL is not None:
+        return _MODEL
     _tf, hub = _lazy_import_tf()
     if hub is None:
         return None
-    if _MODEL is None:
-        _MODEL = hub.load(YAMNET_HUB_URL)
+    _MODEL = hub.load(YAMNET_HUB_URL)
     return _MODEL
 
 
@@ -126,16 +178,10 @@ def _energy_candidates(
 ) -> list[dict]:
     frame_len = max(1, int(frame_seconds * sr))
     hop_len = max(1, int(hop_seconds * sr))
-    energies = []
-    times = []
-    for start in range(0, max(1, audio.shape[0] - frame_len + 1), hop_len):
-        frame = audio[start : start + frame_len]
-        rms = float(np.sqrt(np.mean(frame**2)))
-        energies.append(rms)
-        times.append(start / sr)
-    energies_arr = np.array(energies, dtype=np.float32)
-    times_arr = np.array(times, dtype=np.float32)
-    segments = segments_from_scores(
+    audio = audio.astype(np.float32, copy=False)
+    energies_arr = _frame_rms(audio, frame_len, hop_len).astype(np.float32, copy=False)
+    times_arr = (np.arange(energies_arr.shape[0]) * hop_len / sr).astype(np.float32)
+    segments = segment_arrays_from_scores(
         times_arr,
         energies_arr,
         threshold=threshold,
@@ -145,13 +191,30 @@ def _energy_candidates(
     candidate = {
         "label": "sound",
         "score": float(np.max(energies_arr)) if energies_arr.size else 0.0,
-        "segments": [
-            {"t0": seg.start, "t1": seg.end, "score": seg.score} for seg in segments
-        ],
+        "segments": _segment_dicts(segments),
     }
     return [candidate][:top_n]
 
 
+def _segment_dicts(segments: SegmentArrays) -> list[dict]:
+    starts, ends, scores = segments
+    return [
+        {"t0": t0, "t1": t1, "score": score}
+        for t0, t1, score in zip(starts.tolist(), ends.tolist(), scores.tolist())
+    ]
+
+
+def _top_indices(class_scores: np.ndarray, top_n: int) -> np.ndarray:
+    # Highest-scoring classes first; argpartition avoids sorting all 521 classes.
+    if top_n <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if top_n < class_scores.shape[0]:
+        top = np.argpartition(class_scores, -top_n)[-top_n:]
+    else:
+        top = np.arange(class_scores.shape[0])
+    return top[np.argsort(class_scores[top])[::-1]]
+
+
 def detect_candidates(
     audio: np.ndarray,
     sr: int,
@@ -162,6 +225,7 @@ def detect_candidates(
     merge_gap: float = 0.2,
     min_duration: float = 0.0,
     use_yamnet: bool = True,
+    silence_floor_db: float = DEFAULT_SILENCE_FLOOR_DB,
 ) -> list[dict]:
     if audio.size == 0:
         return []
@@ -169,14 +233,18 @@ def detect_candidates(
     if use_yamnet:
         model = _load_model()
         if model is not None:
+            # Nothing to classify below the floor; skip the model call entirely.
+            peak = peak_abs(audio)
+            if peak < 10.0 ** (silence_floor_db / 20.0):
+                return []
             if sr != YAMNET_SAMPLE_RATE:
                 waveform = resample_audio(audio, sr, YAMNET_SAMPLE_RATE)
+                peak = peak_abs(waveform)
             else:
                 waveform = audio
             waveform = waveform.astype(np.float32, copy=False)
-            peak = float(np.max(np.abs(waveform))) if waveform.size else 0.0
             if peak > 1.0:
-                waveform = waveform / peak
+                waveform = waveform * np.float32(1.0 / peak)
             try:
                 scores, _embeddings, _spectrogram = model(waveform)
             except Exception:
@@ -195,27 +263,24 @@ def detect_candidates(
                 return []
             times = np.arange(scores_np.shape[0], dtype=np.float32) * hop_seconds
             labels = _load_labels()
-            class_scores = scores_np.max(axis=0)
-            top_indices = np.argsort(class_scores)[::-1][:top_n]
+            class_scores = np.empty(scores_np.shape[1], dtype=np.float32)
+            np.max(scores_np, axis=0, out=class_scores)
+            top_indices = _top_indices(class_scores, top_n)
+            segments_per_class = segment_arrays_from_scores_batched(
+                times,
+                scores_np[:, top_indices],
+                threshold=threshold,
+                merge_gap=merge_gap,
+                min_duration=min_duration,
+            )
             candidates = []
-            for idx in top_indices:
+            for idx, segments in zip(top_indices, segments_per_class):
                 label = labels[idx] if idx < len(labels) else f"class_{idx}"
-                label_scores = scores_np[:, idx]
-                segments = segments_from_scores(
-                    times,
-                    label_scores,
-                    threshold=threshold,
-                    merge_gap=merge_gap,
-                    min_duration=min_duration,
-                )
                 candidates.append(
                     {
                         "label": label,
                         "score": float(class_scores[idx]),
-                        "segments": [
-                            {"t0": seg.start, "t1": seg.end, "score": seg.score}
-                            for seg in segments
-                        ],
+                        "segments": _segment_dicts(segments),
                     }
                 )
             return candidates
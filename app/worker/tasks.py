@@ -1,23 +1,52 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
 import shutil
 import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
 
 import numpy as np
 
-from app.core.audio_io import read_audio, slice_audio, write_audio
+from app.core.audio_io import (
+    create_float_wav,
+    iter_audio_blocks,
+    open_audio_frames,
+    open_writer,
+    read_audio,
+    read_audio_frames,
+    read_audio_window,
+    write_audio,
+)
 from app.core.config import DEFAULT_SAMPLE_RATE
-from app.core.hash_cache import cache_path, fingerprint_settings, hash_file
-from app.core.mixing import apply_gain, limiter, mix_tracks, peak_normalize
+from app.core.hash_cache import (
+    cache_path,
+    fingerprint_settings,
+    hash_algorithm,
+    hash_file_cached,
+)
+from app.core.mixing import (
+    apply_gain,
+    apply_gain_limit,
+    mix_tracks,
+    normalize_chain,
+    peak_abs,
+    peak_scale,
+)
 from app.worker.models.sam_audio import separate_prompt
 from app.worker.models.yamnet import detect_candidates
 
 logger = logging.getLogger("uvicorn.error")
 
+_OVERLAP_ADD_KERNEL = None
+# Largest positive 16-bit sample, as a float.
+_PCM16_FULL_SCALE = 32767 / 32768
+
 
 class CancelledError(RuntimeError):
     pass
@@ -33,6 +62,24 @@ def _env_float(name: str, default: float) -> float:
         return default
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+def _resolve_chunk_workers(total_chunks: int) -> int:
+    # 0 = auto: half the CPUs, never more than there are chunks.
+    workers = _env_int("SAM_AUDIO_CHUNK_WORKERS", 1)
+    if workers <= 0:
+        workers = (os.cpu_count() or 2) // 2
+    return max(1, min(workers, total_chunks))
+
+
 def _resolve_chunk_settings(preview_seconds: float | None) -> tuple[float, float]:
     chunk_seconds = _env_float("SAM_AUDIO_CHUNK_SECONDS", 30.0)
     overlap_seconds = _env_float("SAM_AUDIO_CHUNK_OVERLAP", 0.2)
@@ -58,35 +105,73 @@ def _chunk_cache_path(
     return chunk_dir / f"chunk-{start}-{end}.wav"
 
 
-def _build_chunk_ranges(
-    total_len: int, chunk_samples: int, overlap_samples: int
-) -> list[tuple[int, int]]:
-    ranges: list[tuple[int, int]] = []
+def _build_chunk_ranges(total_len: int, chunk_samples: int, overlap_samples: int) -> np.ndarray:
+    # (n, 2) int64 array of [start, end) rows; the last chunk is the first one
+    # that reaches total_len.
     if total_len <= 0:
-        return ranges
+        return np.empty((0, 2), dtype=np.int64)
     step = max(1, chunk_samples - overlap_samples)
-    start = 0
-    while start < total_len:
-        end = min(start + chunk_samples, total_len)
-        ranges.append((start, end))
-        if end == total_len:
-            break
-        start += step
-    return ranges
+    count = 1 + max(0, -(-(total_len - chunk_samples) // step))
+    starts = np.arange(count, dtype=np.int64) * step
+    ends = np.minimum(starts + chunk_samples, total_len)
+    return np.column_stack((starts, ends))
+
+
+def _chunk_meta_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def _write_cached_chunk(path: Path, chunk_out: np.ndarray, sr: int) -> None:
+    # Chunks are cached as 16-bit PCM, scaled so their peak uses the full range
+    # (unnormalized chunks can exceed 1.0); the sidecar keeps the scale to undo it.
+    peak = peak_abs(chunk_out)
+    scale = peak / _PCM16_FULL_SCALE if peak > 0.0 else 1.0
+    write_audio(path, chunk_out * np.float32(1.0 / scale), sr, subtype="PCM_16")
+    # The sidecar is written last, so it also marks the WAV as complete.
+    meta = {"len": int(chunk_out.shape[0]), "sr": int(sr), "sample_bytes": 2, "scale": scale}
+    _chunk_meta_path(path).write_text(json.dumps(meta), encoding="utf-8")
 
 
 def _load_cached_chunk(path: Path, expected_len: int, sr: int) -> np.ndarray | None:
-    if not path.exists():
+    # Validate against the sidecar and file size before decoding any audio.
+    try:
+        meta = json.loads(_chunk_meta_path(path).read_bytes())
+        size = os.path.getsize(path)
+    except (OSError, ValueError):
+        return None
+    if meta.get("len") != expected_len or meta.get("sr") != sr:
+        return None
+    if size < expected_len * meta.get("sample_bytes", 4):
         return None
-    chunk_audio, _ = read_audio(path, target_sr=sr, mono=True)
+    chunk_audio = read_audio_frames(path, 0, expected_len, mono=True)
     if chunk_audio.shape[0] != expected_len:
         return None
+    scale = float(meta.get("scale", 1.0))
+    if scale != 1.0:
+        chunk_audio *= np.float32(scale)
     return chunk_audio
 
 
+def _link_or_copy(src: Path, dst: Path) -> None:
+    # Hardlink when both paths share a filesystem, otherwise copy; staged under a
+    # temp name so dst is replaced atomically.
+    # The copy fallback goes through shutil.copyfile, i.e. sendfile on Linux.
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}")
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+@lru_cache(maxsize=256, typed=True)
 def build_settings_fingerprint(
-    prompts: list[str],
-    gains: list[float],
+    prompts: tuple[str, ...],
+    gains: tuple[float, ...],
     mode: str,
     target_sr: int | None,
     preview_seconds: float | None = None,
@@ -94,15 +179,20 @@ def build_settings_fingerprint(
     chunk_seconds: float | None = None,
     chunk_overlap: float | None = None,
 ) -> str:
+    # Tuples so repeat calls hit the cache; gains must already be floats, since
+    # (1,) and (1.0,) share a cache key.
     settings = {
-        "gains": gains,
+        "gains": list(gains),
         "mode": mode,
-        "prompts": prompts,
+        "prompts": list(prompts),
         "preview_seconds": preview_seconds,
         "preview_start": preview_start,
         "target_sr": target_sr,
         "chunk_seconds": chunk_seconds,
         "chunk_overlap": chunk_overlap,
+        # Bump when the contents of cached chunks change (2: unnormalized chunks).
+        "chunk_version": 2,
+        "hash": hash_algorithm(),
     }
     return fingerprint_settings(settings)
 
@@ -120,6 +210,7 @@ def run_separation(
     gains: list[float],
     mode: str = "keep",
     job_id: str | None = None,
+    normalize: bool = True,
 ) -> np.ndarray:
     residual = audio
     kept_tracks: list[np.ndarray] = []
@@ -133,72 +224,388 @@ def run_separation(
         output = residual
     else:
         raise ValueError(f"unknown mode: {mode}")
-    output = limiter(peak_normalize(output))
+    if not normalize:
+        # Chunked runs normalize once over the stitched output instead.
+        return output
+    output = normalize_chain(output)
     return output
 
 
-def run_separation_chunked(
+def _chunk_layout(sr: int, chunk_seconds: float, overlap_seconds: float) -> tuple[int, int]:
+    chunk_samples = int(round(chunk_seconds * sr))
+    overlap_samples = int(round(overlap_seconds * sr))
+    overlap_samples = max(0, min(overlap_samples, chunk_samples // 2))
+    return chunk_samples, overlap_samples
+
+
+def _iter_chunk_outputs(
     audio: np.ndarray,
     sr: int,
+    ranges: np.ndarray,
     prompts: list[str],
     gains: list[float],
     mode: str,
-    chunk_seconds: float,
-    overlap_seconds: float,
+    cache_dir: str | Path | None = None,
+    audio_hash: str | None = None,
+    settings_hash: str | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    job_id: str | None = None,
+    separation_fn: Callable[..., np.ndarray] | None = None,
+) -> Iterator[np.ndarray]:
+    # Yields the separated output of each range in input order. With two or more
+    # workers, up to that many chunks run ahead on a thread pool; the model calls
+    # release the GIL and the loaded model is shared instead of replicated.
+    # separation_fn stands in for run_separation; bound once, not looked up per chunk.
+    separation = separation_fn or run_separation
+
+    def cache_file(start: int, end: int) -> Path | None:
+        if cache_dir and audio_hash and settings_hash:
+            return _chunk_cache_path(cache_dir, audio_hash, settings_hash, start, end)
+        return None
+
+    def separate(start: int, end: int) -> np.ndarray:
+        if should_cancel and should_cancel():
+            raise CancelledError("cancelled")
+        chunk_audio = np.ascontiguousarray(audio[start:end])
+        return separation(
+            chunk_audio, sr, prompts, gains, mode=mode, job_id=job_id, normalize=False
+        )
+
+    def cached(start: int, end: int) -> tuple[Path | None, np.ndarray | None]:
+        path = cache_file(start, end)
+        if path is None:
+            return None, None
+        return path, _load_cached_chunk(path, end - start, sr)
+
+    def prefetch(start: int, end: int) -> tuple[Path | None, np.ndarray | None, np.ndarray | None]:
+        chunk_path, chunk_out = cached(start, end)
+        chunk_audio = None
+        if chunk_out is None:
+            chunk_audio = np.ascontiguousarray(audio[start:end])
+        return chunk_path, chunk_out, chunk_audio
+
+    # Plain ints: cheaper to index per chunk than numpy scalars.
+    ranges = np.asarray(ranges, dtype=np.int64).reshape(-1, 2).tolist()
+    if not ranges:
+        return
+    workers = _resolve_chunk_workers(len(ranges))
+    if workers < 2:
+        # One loader thread fetches the next chunk (cache lookup or input read)
+        # while the current chunk runs on the model.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-load") as loader:
+            upcoming = loader.submit(prefetch, *ranges[0])
+            for idx in range(len(ranges)):
+                if should_cancel and should_cancel():
+                    raise CancelledError("cancelled")
+                chunk_path, chunk_out, chunk_audio = upcoming.result()
+                if idx + 1 < len(ranges):
+                    upcoming = loader.submit(prefetch, *ranges[idx + 1])
+                if chunk_out is None:
+                    chunk_out = separation(
+                        chunk_audio,
+                        sr,
+                        prompts,
+                        gains,
+                        mode=mode,
+                        job_id=job_id,
+                        normalize=False,
+                    )
+                    if chunk_path is not None:
+                        _write_cached_chunk(chunk_path, chunk_out, sr)
+                yield chunk_out
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk")
+    pending: dict[int, tuple[Path | None, Future | np.ndarray]] = {}
+    submitted = 0
+    try:
+        for idx in range(len(ranges)):
+            while submitted < len(ranges) and submitted < idx + workers:
+                start, end = ranges[submitted]
+                chunk_path, chunk_out = cached(start, end)
+                if chunk_out is None:
+                    chunk_out = executor.submit(separate, start, end)
+                pending[submitted] = (chunk_path, chunk_out)
+                submitted += 1
+            if should_cancel and should_cancel():
+                raise CancelledError("cancelled")
+            chunk_path, chunk_out = pending.pop(idx)
+            if isinstance(chunk_out, Future):
+                chunk_out = chunk_out.result()
+                # Cache files are written from the consuming thread.
+                if chunk_path is not None:
+                    _write_cached_chunk(chunk_path, chunk_out, sr)
+            yield chunk_out
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _lazy_overlap_add_kernel():
+    # Optional numba kernel: fade and accumulate a chunk in one pass with no
+    # temporaries. Compiled on first use; None when numba is missing.
+    global _OVERLAP_ADD_KERNEL
+    if _OVERLAP_ADD_KERNEL is None:
+        try:
+            from numba import njit
+        except ModuleNotFoundError:
+            _OVERLAP_ADD_KERNEL = False
+        else:
+
+            @njit(cache=True, boundscheck=False)
+            def _overlap_add(span, chunk_out, fade_in, fade_out, head, tail):
+                n = chunk_out.shape[0]
+                body_end = n - tail
+                for i in range(head):
+                    span[i] += chunk_out[i] * fade_in[i]
+                for i in range(head, body_end):
+                    span[i] += chunk_out[i]
+                for i in range(tail):
+                    span[body_end + i] += chunk_out[body_end + i] * fade_out[i]
+
+            _OVERLAP_ADD_KERNEL = _overlap_add
+    if _OVERLAP_ADD_KERNEL is False:
+        return None
+    return _OVERLAP_ADD_KERNEL
+
+
+def _overlap_add(
+    span: np.ndarray,
+    chunk_out: np.ndarray,
+    fade_in: np.ndarray,
+    fade_out: np.ndarray,
+    head: int,
+    tail: int,
+) -> None:
+    kernel = _lazy_overlap_add_kernel()
+    if kernel is not None:
+        chunk_out = np.ascontiguousarray(chunk_out, dtype=np.float32)
+        kernel(span, chunk_out, fade_in, fade_out, head, tail)
+        return
+    chunk_len = chunk_out.shape[0]
+    if head:
+        span[:head] += chunk_out[:head] * fade_in
+    span[head : chunk_len - tail] += chunk_out[head : chunk_len - tail]
+    if tail:
+        span[-tail:] += chunk_out[-tail:] * fade_out
+
+
+def _iter_separated_blocks(
+    audio: np.ndarray,
+    sr: int,
+    prompts: list[str],
+    gains: list[float],
+    mode: str,
+    chunk_samples: int,
+    overlap_samples: int,
     cache_dir: str | Path | None = None,
     audio_hash: str | None = None,
     settings_hash: str | None = None,
     progress_callback: Callable[[int, int], None] | None = None,
     should_cancel: Callable[[], bool] | None = None,
     job_id: str | None = None,
-) -> np.ndarray:
+    out: np.ndarray | None = None,
+    separation_fn: Callable[..., np.ndarray] | None = None,
+) -> Iterator[np.ndarray]:
+    # Overlap-add the separated chunks and yield each span as soon as no later
+    # chunk can touch it. Everything accumulates in one chunk-sized float32 buffer
+    # that is reused, so yielded blocks are views that are only valid until the
+    # next iteration; consumers write or copy them right away. Blocks are not
+    # normalized yet. Given a zero-filled, full-length `out`, chunks are added
+    # straight into it instead and the yielded blocks are views of `out`.
     total_len = audio.shape[0]
-    chunk_samples = int(round(chunk_seconds * sr))
-    if chunk_samples <= 0 or total_len <= chunk_samples:
-        return run_separation(audio, sr, prompts, gains, mode=mode, job_id=job_id)
-    overlap_samples = int(round(overlap_seconds * sr))
-    overlap_samples = max(0, min(overlap_samples, chunk_samples // 2))
     ranges = _build_chunk_ranges(total_len, chunk_samples, overlap_samples)
     total_chunks = len(ranges)
-    output = np.zeros(total_len, dtype=np.float32)
-    weight = np.zeros(total_len, dtype=np.float32)
+    starts, ends = ranges[:, 0], ranges[:, 1]
+    # Per-chunk fade lengths and flush points, computed up front so the loop body
+    # has no edge branches: a chunk fades in unless it starts the audio, fades out
+    # unless it ends it, and everything before the next chunk's start is final.
+    heads = np.where(starts > 0, overlap_samples, 0)
+    tails = np.where(ends < total_len, overlap_samples, 0)
+    flush_ends = np.append(starts[1:], total_len)
+    layout = zip(ranges.tolist(), heads.tolist(), tails.tolist(), flush_ends.tolist())
+    flushed = 0
+    # Output index of pending[0]; it only moves when staging in the small buffer.
+    offset = 0
+    # Each chunk starts at the previous flush point, so its span always fits.
+    if out is None:
+        pending = np.zeros(min(chunk_samples, total_len), dtype=np.float32)
+    else:
+        pending = out
+    # Raised-cosine crossfades: fade_in + fade_out == 1 across each overlap, so the
+    # overlap-add needs no weight normalization. Every overlap is exactly
+    # overlap_samples long, since the final chunk always extends past the previous end.
+    phase = (np.arange(overlap_samples) + 0.5) / max(1, overlap_samples)
+    fade_in = (np.sin(0.5 * np.pi * phase) ** 2).astype(np.float32)
+    fade_out = np.float32(1.0) - fade_in
     done_chunks = 0
     if progress_callback:
         progress_callback(done_chunks, total_chunks)
-    for start, end in ranges:
-        if should_cancel and should_cancel():
-            raise CancelledError("cancelled")
-        chunk_len = end - start
-        chunk_audio = audio[start:end]
-        chunk_path = None
-        chunk_out = None
-        if cache_dir and audio_hash and settings_hash:
-            chunk_path = _chunk_cache_path(
-                cache_dir, audio_hash, settings_hash, start, end)
-            chunk_out = _load_cached_chunk(chunk_path, chunk_len, sr)
-        if chunk_out is None:
-            chunk_out = run_separation(
-                chunk_audio, sr, prompts, gains, mode=mode, job_id=job_id
-            )
-            if chunk_path is not None:
-                write_audio(chunk_path, chunk_out, sr)
-        window = np.ones(end - start, dtype=np.float32)
-        if start > 0 and overlap_samples > 0:
-            fade_len = min(overlap_samples, end - start)
-            fade_in = np.linspace(0.0, 1.0, num=fade_len, dtype=np.float32)
-            window[:fade_len] *= fade_in
-        if end < total_len and overlap_samples > 0:
-            fade_len = min(overlap_samples, end - start)
-            fade_out = np.linspace(1.0, 0.0, num=fade_len, dtype=np.float32)
-            window[-fade_len:] *= fade_out
-        output[start:end] += chunk_out * window
-        weight[start:end] += window
+    chunk_outputs = _iter_chunk_outputs(
+        audio,
+        sr,
+        ranges,
+        prompts,
+        gains,
+        mode,
+        cache_dir=cache_dir,
+        audio_hash=audio_hash,
+        settings_hash=settings_hash,
+        should_cancel=should_cancel,
+        job_id=job_id,
+        separation_fn=separation_fn,
+    )
+    for ((start, end), head, tail, final_end), chunk_out in zip(layout, chunk_outputs):
+        _overlap_add(
+            pending[start - offset : end - offset],
+            chunk_out,
+            fade_in,
+            fade_out,
+            head,
+            tail,
+        )
         done_chunks += 1
         if progress_callback:
             progress_callback(done_chunks, total_chunks)
-    output = np.divide(output, weight, out=output, where=weight > 0)
-    output = limiter(peak_normalize(output))
-    return output
+        ready = final_end - offset
+        yield pending[flushed - offset : ready]
+        if out is None:
+            # Carry the overlap tail to the front and clear the rest for the next chunk.
+            carry = end - final_end
+            pending[:carry] = pending[ready : ready + carry]
+            pending[carry:] = 0.0
+            offset = final_end
+        flushed = final_end
+
+
+def run_separation_chunked(
+    audio: np.ndarray,
+    sr: int,
+    prompts: list[str],
+    gains: list[float],
+    mode: str,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    cache_dir: str | Path | None = None,
+    audio_hash: str | None = None,
+    settings_hash: str | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    job_id: str | None = None,
+    separation_fn: Callable[..., np.ndarray] | None = None,
+) -> np.ndarray:
+    total_len = audio.shape[0]
+    chunk_samples, overlap_samples = _chunk_layout(sr, chunk_seconds, overlap_seconds)
+    if chunk_samples <= 0 or total_len <= chunk_samples:
+        separation = separation_fn or run_separation
+        return separation(audio, sr, prompts, gains, mode=mode, job_id=job_id)
+    # Chunks overlap-add straight into the output; zeros come from fresh pages.
+    output = np.zeros(total_len, dtype=np.float32)
+    blocks = _iter_separated_blocks(
+        audio,
+        sr,
+        prompts,
+        gains,
+        mode,
+        chunk_samples,
+        overlap_samples,
+        cache_dir=cache_dir,
+        audio_hash=audio_hash,
+        settings_hash=settings_hash,
+        progress_callback=progress_callback,
+        should_cancel=should_cancel,
+        job_id=job_id,
+        out=output,
+        separation_fn=separation_fn,
+    )
+    for _ in blocks:
+        pass
+    return normalize_chain(output, out=output)
+
+
+def _write_separation_chunked(
+    output_path: Path,
+    audio: np.ndarray,
+    sr: int,
+    prompts: list[str],
+    gains: list[float],
+    mode: str,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    cache_dir: str | Path | None = None,
+    audio_hash: str | None = None,
+    settings_hash: str | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    job_id: str | None = None,
+    separation_fn: Callable[..., np.ndarray] | None = None,
+) -> None:
+    # Streaming counterpart of run_separation_chunked: separated blocks land
+    # directly in a memory-mapped float WAV, which is then normalized in place.
+    # When the output can't be mapped, blocks go to a float scratch file while the
+    # peak is tracked and a second block pass writes the normalized output.
+    # Either way the work happens in a sibling .partial file, so output_path only
+    # ever holds a finished WAV.
+    total_len = audio.shape[0]
+    chunk_samples, overlap_samples = _chunk_layout(sr, chunk_seconds, overlap_seconds)
+    if chunk_samples <= 0 or total_len <= chunk_samples:
+        # audio[:] materializes AudioFrames and is a plain view for arrays.
+        separation = separation_fn or run_separation
+        output = separation(audio[:], sr, prompts, gains, mode=mode, job_id=job_id)
+        write_audio(output_path, output, sr)
+        return
+    partial_path = output_path.with_suffix(".partial")
+    try:
+        # A freshly sized file reads back as zeros, so chunks can accumulate in it.
+        output = create_float_wav(partial_path, total_len, sr)
+    except (OSError, ValueError):
+        partial_path.unlink(missing_ok=True)
+        output = None
+    blocks = _iter_separated_blocks(
+        audio,
+        sr,
+        prompts,
+        gains,
+        mode,
+        chunk_samples,
+        overlap_samples,
+        cache_dir=cache_dir,
+        audio_hash=audio_hash,
+        settings_hash=settings_hash,
+        progress_callback=progress_callback,
+        should_cancel=should_cancel,
+        job_id=job_id,
+        out=output,
+        separation_fn=separation_fn,
+    )
+    if output is not None:
+        try:
+            try:
+                for _ in blocks:
+                    pass
+                normalize_chain(output, out=output)
+                if isinstance(output, np.memmap):
+                    output.flush()
+            finally:
+                # The generator holds out=output; close it so the mapping is released.
+                blocks.close()
+                del output
+            os.replace(partial_path, output_path)
+        except BaseException:
+            partial_path.unlink(missing_ok=True)
+            raise
+        return
+    try:
+        peak = 0.0
+        with open_writer(partial_path, sr) as writer:
+            for block in blocks:
+                peak = max(peak, peak_abs(block))
+                writer.write(block)
+        scale = peak_scale(peak)
+        with open_writer(output_path, sr) as writer:
+            for block in iter_audio_blocks(partial_path, chunk_samples):
+                writer.write(apply_gain_limit(block, scale, out=block))
+    finally:
+        partial_path.unlink(missing_ok=True)
 
 
 def process_job(
@@ -214,7 +621,10 @@ def process_job(
     progress_callback: Callable[[int, int], None] | None = None,
     should_cancel: Callable[[], bool] | None = None,
     job_id: str | None = None,
+    _separation_fn: Callable[..., np.ndarray] | None = None,
 ) -> Path:
+    # _separation_fn replaces run_separation (same signature, including normalize=);
+    # tests inject fakes through it instead of patching the module.
     if should_cancel and should_cancel():
         raise CancelledError("cancelled")
     cache_target = None
@@ -222,10 +632,10 @@ def process_job(
     audio_hash = None
     settings_hash = None
     if cache_dir is not None:
-        audio_hash = hash_file(input_path)
+        audio_hash = hash_file_cached(input_path, cache_dir)
         settings_hash = build_settings_fingerprint(
-            prompts,
-            gains,
+            tuple(prompts),
+            tuple(float(gain) for gain in gains),
             mode,
             target_sr,
             preview_seconds=preview_seconds,
@@ -238,21 +648,19 @@ def process_job(
         if cache_target.exists():
             output_path = Path(output_path)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copyfile(cache_target, output_path)
-            logger.info("Mix cache hit output=%s", output_path)
-            return output_path
+            try:
+                if cache_target.resolve() != output_path.resolve():
+                    _link_or_copy(cache_target, output_path)
+            except FileNotFoundError:
+                # Cleared (e.g. by /jobs/cleanup) after the exists() check.
+                logger.info("Mix cache entry vanished; recomputing %s", cache_target)
+            else:
+                logger.info("Mix cache hit output=%s", output_path)
+                return output_path
 
     job_tag = f" job={job_id}" if job_id else ""
     load_start = time.time()
     logger.info("Mix load audio%s input=%s", job_tag, input_path)
-    audio, sr = read_audio(input_path, target_sr=target_sr, mono=True)
-    logger.info(
-        "Mix load audio done%s seconds=%.2f samples=%d sr=%d",
-        job_tag,
-        time.time() - load_start,
-        audio.shape[0],
-        sr,
-    )
     if preview_seconds and preview_seconds > 0:
         start = float(preview_start or 0.0)
         if start < 0:
@@ -264,7 +672,24 @@ def process_job(
             start,
             preview_seconds,
         )
-        audio = slice_audio(audio, sr, start, end)
+        # Previews only decode their window rather than the whole upload.
+        audio, sr = read_audio_window(input_path, start, end, target_sr=target_sr, mono=True)
+    else:
+        audio = None
+        if chunk_seconds > 0:
+            # Long full mixes stream their input chunk by chunk from disk.
+            frames = open_audio_frames(input_path, target_sr=target_sr, mono=True)
+            if frames is not None and frames.shape[0] > chunk_seconds * frames.sr:
+                audio, sr = frames, frames.sr
+        if audio is None:
+            audio, sr = read_audio(input_path, target_sr=target_sr, mono=True)
+    logger.info(
+        "Mix load audio done%s seconds=%.2f samples=%d sr=%d",
+        job_tag,
+        time.time() - load_start,
+        audio.shape[0],
+        sr,
+    )
     duration = audio.shape[0] / float(sr) if sr else 0.0
     sep_start = time.time()
     logger.info(
@@ -274,8 +699,13 @@ def process_job(
         mode,
         duration,
     )
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # The writers below rewrite in place; never through a hardlink to a cache entry.
+    output_path.unlink(missing_ok=True)
     if chunk_seconds > 0 and duration > chunk_seconds:
-        output = run_separation_chunked(
+        _write_separation_chunked(
+            output_path,
             audio,
             sr,
             prompts,
@@ -289,24 +719,30 @@ def process_job(
             progress_callback=progress_callback,
             should_cancel=should_cancel,
             job_id=job_id,
+            separation_fn=_separation_fn,
+        )
+        logger.info(
+            "Mix separate done%s seconds=%.2f output=%s",
+            job_tag,
+            time.time() - sep_start,
+            output_path,
         )
     else:
-        output = run_separation(audio, sr, prompts, gains, mode=mode, job_id=job_id)
+        separation = _separation_fn or run_separation
+        output = separation(audio, sr, prompts, gains, mode=mode, job_id=job_id)
         if progress_callback:
             progress_callback(1, 1)
-    logger.info("Mix separate done%s seconds=%.2f", job_tag, time.time() - sep_start)
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    write_start = time.time()
-    write_audio(output_path, output, sr)
-    logger.info(
-        "Mix write output%s seconds=%.2f output=%s",
-        job_tag,
-        time.time() - write_start,
-        output_path,
-    )
+        logger.info("Mix separate done%s seconds=%.2f", job_tag, time.time() - sep_start)
+        write_start = time.time()
+        write_audio(output_path, output, sr)
+        logger.info(
+            "Mix write output%s seconds=%.2f output=%s",
+            job_tag,
+            time.time() - write_start,
+            output_path,
+        )
     if cache_target is not None:
         cache_target.parent.mkdir(parents=True, exist_ok=True)
         if cache_target.resolve() != output_path.resolve():
-            shutil.copyfile(output_path, cache_target)
+            _link_or_copy(output_path, cache_target)
     return output_path
@@ -135,7 +135,7 @@ def _meta_summary(name: str, meta: dict | None) -> str | None:
     return f"- {name}: " + " | ".join(parts)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(
         description="Compare benchmark JSON results across devices and print a Markdown table."
     )
@@ -145,7 +145,7 @@ def main() -> None:
         type=_parse_device_arg,
         help="Device results to compare, e.g. --device mps=path.json --device cpu=path.json",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     devices = args.device if args.device else _default_devices()
 
@@ -181,7 +181,8 @@ def main() -> None:
 
     print("Device comparison")
     print(_build_table(devices, by_device))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
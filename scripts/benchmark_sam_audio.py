@@ -7,10 +7,14 @@ import platform
 import subprocess
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
+import numpy as np
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
@@ -59,18 +63,9 @@ def _format_prompts(prompts: Iterable[str]) -> str:
 def _percentile(values: list[float], q: float) -> float:
     if not values:
         return 0.0
-    if q <= 0.0:
-        return min(values)
-    if q >= 1.0:
-        return max(values)
-    ordered = sorted(values)
-    pos = (len(ordered) - 1) * q
-    lo = int(pos)
-    hi = min(lo + 1, len(ordered) - 1)
-    if lo == hi:
-        return ordered[lo]
-    frac = pos - lo
-    return ordered[lo] * (1.0 - frac) + ordered[hi] * frac
+    # Linear interpolation between closest ranks (numpy's default method).
+    q = min(1.0, max(0.0, q))
+    return float(np.percentile(np.asarray(values, dtype=np.float64), q * 100.0))
 
 
 def _summarize_runs(elapsed_runs: list[float]) -> dict[str, float]:
@@ -108,7 +103,11 @@ def _markdown_table(rows: list[dict]) -> str:
     return "\n".join([header, sep, *body_lines])
 
 
+@lru_cache(maxsize=None)
 def _safe_sysctl(name: str) -> str | None:
+    # The hw.*/machdep.* keys only exist on macOS/BSD; skip the fork on Linux.
+    if sys.platform.startswith("linux"):
+        return None
     try:
         result = subprocess.run(
             ["sysctl", "-n", name],
@@ -122,6 +121,18 @@ def _safe_sysctl(name: str) -> str | None:
     return value or None
 
 
+def _read_meminfo_total() -> int | None:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+@lru_cache(maxsize=None)
 def _detect_memory_bytes() -> int | None:
     # Prefer macOS sysctl when available.
     memsize = _safe_sysctl("hw.memsize")
@@ -131,6 +142,11 @@ def _detect_memory_bytes() -> int | None:
         except ValueError:
             pass
 
+    # Linux: read /proc/meminfo directly.
+    mem_total = _read_meminfo_total()
+    if mem_total:
+        return mem_total
+
     # Portable-ish fallback for many Unix systems.
     try:
         page_size = os.sysconf("SC_PAGE_SIZE")
@@ -164,7 +180,9 @@ def _detect_torch_info() -> dict[str, Any]:
     }
 
 
-def _collect_benchmark_meta(preview_seconds: float, warmup: int, repeats: int) -> dict[str, Any]:
+def _collect_benchmark_meta(
+    preview_seconds: float, warmup: int, repeats: int, case_workers: int = 1
+) -> dict[str, Any]:
     mem_bytes = _detect_memory_bytes()
     mem_gb = (mem_bytes / float(1024**3)) if mem_bytes else None
 
@@ -200,11 +218,106 @@ def _collect_benchmark_meta(preview_seconds: float, warmup: int, repeats: int) -
             "preview_seconds": preview_seconds,
             "warmup": warmup,
             "repeats": repeats,
+            "case_workers": case_workers,
         },
     }
     return meta
 
 
+def _run_case(
+    case: BenchmarkCase,
+    assets_dir: Path,
+    output_dir: Path,
+    preview_seconds: float,
+    preview_start: float,
+    repeats: int,
+    warmup: int,
+) -> dict:
+    input_path = assets_dir / case.filename
+    case_out_dir = output_dir / case.case_id
+    case_out_dir.mkdir(parents=True, exist_ok=True)
+    output_path = case_out_dir / "output.wav"
+
+    if not input_path.exists():
+        return {
+            "case_id": case.case_id,
+            "filename": case.filename,
+            "prompts": _format_prompts(case.prompts),
+            "preview_seconds": preview_seconds,
+            "runs": 0,
+            "elapsed_seconds_runs": [],
+            "elapsed_seconds_mean": 0.0,
+            "elapsed_seconds_p50": 0.0,
+            "elapsed_seconds_p95": 0.0,
+            "elapsed_seconds_min": 0.0,
+            "elapsed_seconds_max": 0.0,
+            "rtf_mean": 0.0,
+            "x_realtime_mean": 0.0,
+            "status": "missing_input",
+            "error": f"missing file: {input_path}",
+            "errors": [f"missing file: {input_path}"],
+            "output_path": str(output_path),
+        }
+
+    audio, sr = read_audio(input_path, target_sr=None, mono=True)
+    duration_seconds = audio.shape[0] / float(sr)
+    effective_preview_seconds = min(duration_seconds, preview_seconds)
+    gains = [1.0] * len(case.prompts)
+
+    elapsed_runs: list[float] = []
+    errors: list[str] = []
+
+    total_runs = max(0, warmup) + max(1, repeats)
+    for run_idx in range(total_runs):
+        start_time = time.perf_counter()
+        try:
+            tasks.process_job(
+                input_path=input_path,
+                output_path=output_path,
+                prompts=list(case.prompts),
+                gains=gains,
+                mode=case.mode,
+                target_sr=DEFAULT_SAMPLE_RATE,
+                preview_seconds=effective_preview_seconds,
+                preview_start=preview_start,
+                cache_dir=None,
+            )
+        except Exception as exc:  # pragma: no cover - best effort reporting
+            errors.append(str(exc))
+        elapsed_seconds = time.perf_counter() - start_time
+        if run_idx >= warmup:
+            elapsed_runs.append(elapsed_seconds)
+
+    summary = _summarize_runs(elapsed_runs)
+    mean_elapsed = summary["mean"]
+    if effective_preview_seconds > 0 and mean_elapsed > 0:
+        rtf_mean = mean_elapsed / effective_preview_seconds
+        x_realtime_mean = effective_preview_seconds / mean_elapsed
+    else:
+        rtf_mean = 0.0
+        x_realtime_mean = 0.0
+
+    return {
+        "case_id": case.case_id,
+        "filename": case.filename,
+        "prompts": _format_prompts(case.prompts),
+        "preview_seconds": effective_preview_seconds,
+        "runs": len(elapsed_runs),
+        "elapsed_seconds_runs": elapsed_runs,
+        "elapsed_seconds_mean": mean_elapsed,
+        "elapsed_seconds_p50": summary["p50"],
+        "elapsed_seconds_p95": summary["p95"],
+        "elapsed_seconds_min": summary["min"],
+        "elapsed_seconds_max": summary["max"],
+        "rtf_mean": rtf_mean,
+        "x_realtime_mean": x_realtime_mean,
+        "status": "error" if errors else "ok",
+        "error": errors[0] if errors else None,
+        "errors": errors,
+        "output_path": str(output_path),
+    }
+
+
 def run_benchmark(
     assets_dir: Path,
     output_dir: Path,
@@ -213,105 +326,22 @@ def run_benchmark(
     limit: int | None,
     repeats: int,
     warmup: int,
+    case_workers: int = 1,
 ) -> list[dict]:
     cases = list(DEFAULT_CASES)
     if limit is not None:
         cases = cases[: max(0, limit)]
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    results: list[dict] = []
-
-    for case in cases:
-        input_path = assets_dir / case.filename
-        case_out_dir = output_dir / case.case_id
-        case_out_dir.mkdir(parents=True, exist_ok=True)
-        output_path = case_out_dir / "output.wav"
-
-        if not input_path.exists():
-            results.append(
-                {
-                    "case_id": case.case_id,
-                    "filename": case.filename,
-                    "prompts": _format_prompts(case.prompts),
-                    "preview_seconds": preview_seconds,
-                    "runs": 0,
-                    "elapsed_seconds_runs": [],
-                    "elapsed_seconds_mean": 0.0,
-                    "elapsed_seconds_p50": 0.0,
-                    "elapsed_seconds_p95": 0.0,
-                    "elapsed_seconds_min": 0.0,
-                    "elapsed_seconds_max": 0.0,
-                    "rtf_mean": 0.0,
-                    "x_realtime_mean": 0.0,
-                    "status": "missing_input",
-                    "error": f"missing file: {input_path}",
-                    "errors": [f"missing file: {input_path}"],
-                    "output_path": str(output_path),
-                }
-            )
-            continue
-
-        audio, sr = read_audio(input_path, target_sr=None, mono=True)
-        duration_seconds = audio.shape[0] / float(sr)
-        effective_preview_seconds = min(duration_seconds, preview_seconds)
-        gains = [1.0] * len(case.prompts)
-
-        elapsed_runs: list[float] = []
-        errors: list[str] = []
-
-        total_runs = max(0, warmup) + max(1, repeats)
-        for run_idx in range(total_runs):
-            start_time = time.perf_counter()
-            try:
-                tasks.process_job(
-                    input_path=input_path,
-                    output_path=output_path,
-                    prompts=list(case.prompts),
-                    gains=gains,
-                    mode=case.mode,
-                    target_sr=DEFAULT_SAMPLE_RATE,
-                    preview_seconds=effective_preview_seconds,
-                    preview_start=preview_start,
-                    cache_dir=None,
-                )
-            except Exception as exc:  # pragma: no cover - best effort reporting
-                errors.append(str(exc))
-            elapsed_seconds = time.perf_counter() - start_time
-            if run_idx >= warmup:
-                elapsed_runs.append(elapsed_seconds)
-
-        summary = _summarize_runs(elapsed_runs)
-        mean_elapsed = summary["mean"]
-        if effective_preview_seconds > 0 and mean_elapsed > 0:
-            rtf_mean = mean_elapsed / effective_preview_seconds
-            x_realtime_mean = effective_preview_seconds / mean_elapsed
-        else:
-            rtf_mean = 0.0
-            x_realtime_mean = 0.0
-
-        results.append(
-            {
-                "case_id": case.case_id,
-                "filename": case.filename,
-                "prompts": _format_prompts(case.prompts),
-                "preview_seconds": effective_preview_seconds,
-                "runs": len(elapsed_runs),
-                "elapsed_seconds_runs": elapsed_runs,
-                "elapsed_seconds_mean": mean_elapsed,
-                "elapsed_seconds_p50": summary["p50"],
-                "elapsed_seconds_p95": summary["p95"],
-                "elapsed_seconds_min": summary["min"],
-                "elapsed_seconds_max": summary["max"],
-                "rtf_mean": rtf_mean,
-                "x_realtime_mean": x_realtime_mean,
-                "status": "error" if errors else "ok",
-                "error": errors[0] if errors else None,
-                "errors": errors,
-                "output_path": str(output_path),
-            }
-        )
+    case_args = (assets_dir, output_dir, preview_seconds, preview_start, repeats, warmup)
+    if case_workers < 2 or len(cases) < 2:
+        return [_run_case(case, *case_args) for case in cases]
 
-    return results
+    # Each worker process loads its own model and runs its case's warmup and
+    # repeats serially; results keep the case order.
+    with ProcessPoolExecutor(max_workers=min(case_workers, len(cases))) as executor:
+        futures = [executor.submit(_run_case, case, *case_args) for case in cases]
+        return [future.result() for future in futures]
 
 
 def main() -> None:
@@ -360,6 +390,15 @@ def main() -> None:
         default=1,
         help="Number of warmup runs per case (default: 1).",
     )
+    parser.add_argument(
+        "--case-workers",
+        type=int,
+        default=1,
+        help=(
+            "Run up to N cases in parallel processes (default: 1). Each process loads "
+            "its own model; use SAM_AUDIO_DEVICE=cpu to avoid GPU contention."
+        ),
+    )
     parser.add_argument(
         "--json-out",
         type=Path,
@@ -372,6 +411,7 @@ def main() -> None:
     warmup = max(0, args.warmup)
     preview_seconds = max(0.0, args.preview_seconds)
     preview_start = max(0.0, args.preview_start)
+    case_workers = max(1, args.case_workers)
 
     results = run_benchmark(
         assets_dir=args.assets_dir,
@@ -381,12 +421,14 @@ def main() -> None:
         limit=args.limit,
         repeats=repeats,
         warmup=warmup,
+        case_workers=case_workers,
     )
 
     meta = _collect_benchmark_meta(
         preview_seconds=preview_seconds,
         warmup=warmup,
         repeats=repeats,
+        case_workers=case_workers,
     )
 
     args.json_out.parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session")
+def sine_tone():
+    # Session-wide factory: each (sr, duration, freq, amp) tone is built once in
+    # float32 and shared read-only across tests.
+    cache: dict[tuple, np.ndarray] = {}
+
+    def _make(sr: int, duration: float, freq: float = 220.0, amp: float = 0.2) -> np.ndarray:
+        key = (sr, duration, freq, amp)
+        tone = cache.get(key)
+        if tone is None:
+            t = np.arange(int(sr * duration), dtype=np.float32) * np.float32(1.0 / sr)
+            tone = np.float32(amp) * np.sin(np.float32(2 * np.pi * freq) * t)
+            tone.setflags(write=False)
+            cache[key] = tone
+        return tone
+
+    return _make
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "requires_audio: skip when soundfile (audio_io dependencies) is missing"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Probe the audio dependencies once per session instead of in every test body.
+    from app.core import audio_io
+
+    if audio_io.dependencies_ok():
+        return
+    skip_audio = pytest.mark.skip(reason="audio_io dependencies missing")
+    for item in items:
+        if "requires_audio" in item.keywords:
+            item.add_marker(skip_audio)
@@ -1,5 +1,5 @@
-import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
@@ -7,20 +7,170 @@ import pytest
 from app.core import audio_io
 
 
-def test_audio_io_roundtrip_and_slice():
-    if not audio_io.dependencies_ok():
-        pytest.skip("audio_io dependencies missing")
+@pytest.mark.requires_audio
+def test_audio_io_roundtrip_and_slice(tmp_path: Path, sine_tone):
     sr = 8000
     duration = 0.5
-    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    tone = 0.2 * np.sin(2 * np.pi * 220.0 * t).astype(np.float32)
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        path = Path(tmpdir) / "tone.wav"
-        audio_io.write_audio(path, tone, sr)
-        audio, out_sr = audio_io.read_audio(path, target_sr=4000, mono=True)
-        assert out_sr == 4000
-        assert audio.shape[0] == 2000
-
-        clip = audio_io.slice_audio(audio, 4000, 0.1, 0.2)
-        assert clip.shape[0] == 400
+    tone = sine_tone(sr, duration)
+
+    path = tmp_path / "tone.wav"
+    audio_io.write_audio(path, tone, sr)
+    audio, out_sr = audio_io.read_audio(path, target_sr=4000, mono=True)
+    assert out_sr == 4000
+    assert audio.shape[0] == 2000
+
+    clip = audio_io.slice_audio(audio, 4000, 0.1, 0.2)
+    assert clip.shape[0] == 400
+    assert np.shares_memory(clip, audio)
+    assert not clip.flags.writeable
+
+
+def test_resample_audio_length_and_dtype(sine_tone):
+    sr = 16000
+    tone = sine_tone(sr, 1.0, freq=440.0, amp=0.5)
+
+    down = audio_io.resample_audio(tone, sr, 8000)
+    assert down.dtype == np.float32
+    assert down.shape[0] == 8000
+
+    up = audio_io.resample_audio(down, 8000, sr)
+    assert up.shape[0] == sr
+    # Polyphase filtering keeps an in-band tone intact away from the edges.
+    assert np.allclose(up[1000:-1000], tone[1000:-1000], atol=1e-2)
+
+
+def test_resample_audio_prefers_soxr(monkeypatch):
+    calls = []
+
+    def fake_resample(audio, orig_sr, target_sr, quality):
+        calls.append((audio.dtype, orig_sr, target_sr, quality))
+        return audio[::2]
+
+    monkeypatch.setattr(audio_io, "soxr", SimpleNamespace(resample=fake_resample))
+    out = audio_io.resample_audio(np.zeros(10, dtype=np.float64), 16000, 8000)
+    assert out.shape[0] == 5
+    assert calls == [(np.float32, 16000, 8000, "HQ")]
+
+
+@pytest.mark.requires_audio
+def test_read_audio_cache_returns_readonly_and_tracks_rewrites(tmp_path: Path):
+    audio_io.clear_cache()
+    sr = 8000
+    path = tmp_path / "tone.wav"
+    audio_io.write_audio(path, np.full(800, 0.25, dtype=np.float32), sr)
+
+    first, _ = audio_io.read_audio(path, mono=True)
+    second, _ = audio_io.read_audio(path, mono=True)
+    assert second is first
+    assert not first.flags.writeable
+
+    audio_io.write_audio(path, np.full(400, 0.5, dtype=np.float32), sr)
+    rewritten, _ = audio_io.read_audio(path, mono=True)
+    assert rewritten.shape[0] == 400
+
+
+@pytest.mark.requires_audio
+def test_read_audio_window_matches_full_slice(tmp_path: Path):
+    sr = 8000
+    audio = np.linspace(-1.0, 1.0, sr, endpoint=False).astype(np.float32)
+    path = tmp_path / "ramp.wav"
+    audio_io.write_audio(path, audio, sr)
+
+    full, _ = audio_io.read_audio(path, mono=True)
+    window, window_sr = audio_io.read_audio_window(path, 0.25, 0.5, mono=True)
+    assert window_sr == sr
+    assert np.array_equal(window, audio_io.slice_audio(full, sr, 0.25, 0.5))
+    assert audio_io.audio_duration(path) == 1.0
+
+
+@pytest.mark.requires_audio
+def test_extract_audio_copies_matching_wav(tmp_path: Path, sine_tone):
+    sr = 8000
+    tone = sine_tone(sr, 0.25)
+    src = tmp_path / "src.wav"
+    audio_io.write_audio(src, tone, sr)
+
+    dst = tmp_path / "dst.wav"
+    audio, out_sr = audio_io.extract_audio(src, dst, target_sr=sr, mono=True)
+    assert out_sr == sr
+    assert dst.read_bytes() == src.read_bytes()
+    assert audio.shape[0] == tone.shape[0]
+
+    resampled = tmp_path / "resampled.wav"
+    audio, out_sr = audio_io.extract_audio(src, resampled, target_sr=16000, mono=True)
+    assert out_sr == 16000
+    assert audio_io.audio_duration(resampled) == pytest.approx(0.25, abs=1e-3)
+
+
+@pytest.mark.requires_audio
+def test_write_audio_keeps_float_samples(tmp_path: Path):
+    sr = 8000
+    audio = np.linspace(-0.5, 0.5, 1000).astype(np.float64) + 1e-6
+    path = tmp_path / "float.wav"
+    audio_io.write_audio(path, audio, sr)
+    loaded, _ = audio_io.read_audio(path, mono=True)
+    assert loaded.dtype == np.float32
+    assert np.allclose(loaded, audio.astype(np.float32), atol=1e-7)
+
+
+@pytest.mark.requires_audio
+def test_write_audio_pcm16_rounds_to_nearest_step(tmp_path: Path):
+    sr = 8000
+    audio = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 2.0, -2.0, 0.6 / 32768], dtype=np.float32)
+    path = tmp_path / "pcm16.wav"
+    audio_io.write_audio(path, audio, sr, subtype="PCM_16")
+    assert audio_io.sf.info(str(path)).subtype == "PCM_16"
+    loaded, _ = audio_io.read_audio(path, mono=True)
+    expected = np.array([0, 16384, -16384, 32767, -32768, 32767, -32768, 1]) / 32768
+    assert np.array_equal(loaded, expected.astype(np.float32))
+
+
+@pytest.mark.requires_audio
+def test_read_audio_downmixes_in_float32(tmp_path: Path, monkeypatch):
+    # Small scratch blocks so the downmix spans several reads, ending mid-block.
+    monkeypatch.setattr(audio_io, "_READ_BLOCK_FRAMES", 128)
+    sr = 8000
+    rng = np.random.default_rng(0)
+    for channels in (2, 3):
+        stereo = rng.uniform(-0.5, 0.5, size=(400, channels)).astype(np.float32)
+        path = tmp_path / f"multi-{channels}.wav"
+        audio_io.write_audio(path, stereo, sr)
+        mono, _ = audio_io.read_audio(path, mono=True)
+        assert mono.dtype == np.float32
+        assert np.allclose(mono, stereo.mean(axis=1), atol=1e-6)
+        both, _ = audio_io.read_audio(path, mono=False)
+        assert np.array_equal(both, stereo)
+
+
+@pytest.mark.requires_audio
+def test_audio_frames_reads_slices_from_disk(tmp_path: Path):
+    sr = 8000
+    stereo = np.random.default_rng(2).uniform(-0.5, 0.5, (sr, 2)).astype(np.float32)
+    path = tmp_path / "stereo.wav"
+    audio_io.write_audio(path, stereo, sr)
+
+    full, _ = audio_io.read_audio(path, mono=True)
+    frames = audio_io.open_audio_frames(path, target_sr=sr)
+    assert frames is not None
+    assert frames.shape == full.shape and len(frames) == sr
+    np.testing.assert_array_equal(frames[100:900], full[100:900])
+    np.testing.assert_array_equal(frames[:], full)
+    assert frames[sr - 10 : sr + 50].shape == (10,)
+    assert audio_io.open_audio_frames(path, target_sr=16000) is None
+
+
+@pytest.mark.requires_audio
+def test_create_float_wav_maps_sample_data(tmp_path: Path):
+    path = tmp_path / "mapped.wav"
+    data = np.linspace(-1.0, 1.0, 1000, dtype=np.float32)
+    mapped = audio_io.create_float_wav(path, data.shape[0], 16000)
+    mapped[:] = data
+    mapped *= np.float32(0.5)
+    mapped.flush()
+    del mapped
+
+    info = audio_io.sf.info(str(path))
+    assert (info.samplerate, info.channels, info.frames) == (16000, 1, 1000)
+    assert info.subtype == "FLOAT"
+    audio, _ = audio_io.read_audio(path)
+    np.testing.assert_array_equal(audio, data * np.float32(0.5))
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
+import importlib.util
 import json
-import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
 
+def _load_benchmark_compare():
+    # scripts/ is not a package; load the module from its path and call main()
+    # in-process instead of spawning an interpreter.
+    spec = importlib.util.spec_from_file_location(
+        "benchmark_compare", ROOT_DIR / "scripts" / "benchmark_compare.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses resolve string annotations through sys.modules.
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
 def _row(case_id: str, prompts: str, mean: float, p95: float) -> dict:
     return {
         "case_id": case_id,
@@ -17,7 +43,9 @@ def _row(case_id: str, prompts: str, mean: float, p95: float) -> dict:
     }
 
 
-def test_benchmark_compare_supports_meta_and_legacy_formats(tmp_path: Path) -> None:
+def test_benchmark_compare_supports_meta_and_legacy_formats(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
     # New format: { meta, results }
     mps_path = tmp_path / "mps.json"
     mps_payload = {
@@ -34,7 +62,7 @@ def test_benchmark_compare_supports_meta_and_legacy_formats(tmp_path: Path) -> N
             _row("music", "music", 20.0, 22.0),
         ],
     }
-    mps_path.write_text(json.dumps(mps_payload), encoding="utf-8")
+    mps_path.write_bytes(_dumps(mps_payload))
 
     # Legacy format: [ ... ]
     cpu_path = tmp_path / "cpu.json"
@@ -42,26 +70,15 @@ def test_benchmark_compare_supports_meta_and_legacy_formats(tmp_path: Path) -> N
         _row("speech", "speech", 15.0, 16.0),
         _row("music", "music", 25.0, 26.0),
     ]
-    cpu_path.write_text(json.dumps(cpu_payload), encoding="utf-8")
-
-    result = subprocess.run(
-        [
-            sys.executable,
-            "scripts/benchmark_compare.py",
-            "--device",
-            f"mps={mps_path}",
-            "--device",
-            f"cpu={cpu_path}",
-        ],
-        cwd=ROOT_DIR,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+    cpu_path.write_bytes(_dumps(cpu_payload))
+
+    benchmark_compare = _load_benchmark_compare()
+    rc = benchmark_compare.main(["--device", f"mps={mps_path}", "--device", f"cpu={cpu_path}"])
+    stdout = capsys.readouterr().out
 
-    assert result.returncode == 0, result.stderr
-    assert "Environment summary" in result.stdout
-    assert "Device comparison" in result.stdout
-    assert "speech" in result.stdout
-    assert "music" in result.stdout
+    assert rc == 0
+    assert "Environment summary" in stdout
+    assert "Device comparison" in stdout
+    assert "speech" in stdout
+    assert "music" in stdout
 
@@ -0,0 +1,84 @@
+import numpy as np
+
+from app.worker.models import yamnet
+from app.worker.models.yamnet import _energy_candidates
+
+
+def test_energy_candidates_finds_loud_span():
+    sr = 1000
+    audio = np.zeros(sr * 4, dtype=np.float32)
+    audio[sr : 2 * sr] = 0.5
+    candidates = _energy_candidates(
+        audio,
+        sr,
+        top_n=12,
+        frame_seconds=0.2,
+        hop_seconds=0.1,
+        threshold=0.1,
+        merge_gap=0.0,
+        min_duration=0.0,
+    )
+    assert len(candidates) == 1
+    assert np.isclose(candidates[0]["score"], 0.5)
+    segments = candidates[0]["segments"]
+    assert len(segments) == 1
+    assert np.isclose(segments[0]["t0"], 0.9, atol=1e-6)
+    assert np.isclose(segments[0]["t1"], 2.0, atol=1e-6)
+
+
+def test_energy_candidates_short_clip_uses_single_frame():
+    audio = np.full(50, 0.3, dtype=np.float32)
+    candidates = _energy_candidates(audio, 1000, 12, 0.2, 0.1, 0.1, 0.2, 0.0)
+    assert np.isclose(candidates[0]["score"], 0.3)
+
+
+def test_frame_rms_kernel_path_matches_numpy(monkeypatch):
+    audio = np.random.default_rng(0).uniform(-1.0, 1.0, 5000).astype(np.float32)
+    expected = yamnet._frame_rms(audio, 400, 160)
+
+    def _python_kernel(samples, frame_len, hop_len, n_frames, out):
+        for i in range(n_frames):
+            frame = samples[i * hop_len : i * hop_len + frame_len].astype(np.float64)
+            out[i] = np.sqrt(np.dot(frame, frame) / frame_len)
+
+    monkeypatch.setattr(yamnet, "_NUMBA_MIN_SAMPLES", 0)
+    monkeypatch.setattr(yamnet, "_lazy_rms_kernel", lambda: _python_kernel)
+    result = yamnet._frame_rms(audio, 400, 160)
+    assert result.shape == expected.shape
+    assert np.allclose(result, expected, atol=1e-5)
+
+
+def test_detect_candidates_ranks_yamnet_classes(monkeypatch):
+    scores = np.zeros((6, 5), dtype=np.float32)
+    scores[1:3, 3] = 0.9
+    scores[4, 1] = 0.5
+    scores[0, 0] = 0.05
+
+    class _Tensor:
+        def __init__(self, value):
+            self.value = value
+
+        def numpy(self):
+            return self.value
+
+    monkeypatch.setattr(yamnet, "_load_model", lambda: lambda _wave: (_Tensor(scores), None, None))
+    monkeypatch.setattr(yamnet, "_load_labels", lambda: ["a", "b", "c", "d", "e"])
+    audio = np.full(16000, 0.1, dtype=np.float32)
+    candidates = yamnet.detect_candidates(audio, 16000, top_n=2, hop_seconds=0.5)
+    assert [item["label"] for item in candidates] == ["d", "b"]
+    assert candidates[0]["segments"] == [{"t0": 0.5, "t1": 1.5, "score": candidates[0]["score"]}]
+    assert len(candidates[1]["segments"]) == 1
+
+
+def test_detect_candidates_skips_model_for_silence(monkeypatch):
+    def _model(_waveform):
+        raise AssertionError("model should not run on silent audio")
+
+    monkeypatch.setattr(yamnet, "_load_model", lambda: _model)
+    audio = np.full(16000, 1e-4, dtype=np.float32)
+    assert yamnet.detect_candidates(audio, 16000) == []
+
+    # Without the model, quiet input still takes the energy fallback.
+    monkeypatch.setattr(yamnet, "_load_model", lambda: None)
+    fallback = yamnet.detect_candidates(audio, 16000)
+    assert [candidate["label"] for candidate in fallback] == ["sound"]
@@ -28,3 +28,15 @@ def test_classify_error_mappings():
 
     code, _ = classify_error(RuntimeError("some unexpected error"))
     assert code == "UNKNOWN_ERROR"
+
+
+def test_classify_error_keeps_rule_order_and_spans_lines():
+    code, _ = classify_error(RuntimeError("huggingface token missing: input audio not found"))
+    assert code == "INPUT_NOT_FOUND"
+
+    code, _ = classify_error(RuntimeError("Cannot access gated repo.\nHuggingFace says forbidden"))
+    assert code == "HF_ACCESS"
+
+    code, detail = classify_error(ValueError(""))
+    assert code == "UNKNOWN_ERROR"
+    assert detail == "ValueError"
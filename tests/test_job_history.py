@@ -1,7 +1,11 @@
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-from app.api import routes_jobs
+from app.api import job_store, routes_jobs
 from app.api.schemas import CleanupRequest, Job, JobMixSummary, JobStatus
 
 
@@ -43,12 +47,14 @@ def test_job_history_persists_and_loads(tmp_path: Path):
         ],
     )
     routes_jobs._set_job(job)
-    assert (store_root / "job-123.json").exists()
+    assert job_store.db_path(store_root).exists()
 
     _reset_state()
     routes_jobs._load_jobs_from_disk()
     loaded = routes_jobs._jobs.get("job-123")
     assert loaded is not None
+    assert loaded.status is JobStatus.DONE
+    assert loaded.created_at == job.created_at
     assert loaded.last_mix is not None
     assert loaded.last_mix.output_name == "output-test.wav"
     assert loaded.mix_history is not None
@@ -86,7 +92,7 @@ def test_delete_job_removes_record_and_files(tmp_path: Path):
 
     response = routes_jobs.delete_job(job_id)
     assert response["id"] == job_id
-    assert not (store_root / f"{job_id}.json").exists()
+    assert job_store.load_jobs(store_root) == []
     assert not upload_dir.exists()
     assert not output_dir.exists()
     assert job_id not in routes_jobs._jobs
@@ -132,3 +138,215 @@ def test_cleanup_removes_old_jobs_and_outputs(tmp_path: Path):
     assert response["cleared_cache"] is True
     remaining = list(routes_jobs._jobs.keys())
     assert len(remaining) == 1
+
+
+def test_legacy_json_job_files_are_imported(tmp_path: Path):
+    store_root = tmp_path / "jobs"
+    store_root.mkdir(parents=True, exist_ok=True)
+    routes_jobs._job_store_root = store_root
+    _reset_state()
+
+    job = Job(
+        id="job-legacy",
+        status=JobStatus.DONE,
+        created_at=datetime(2024, 1, 1),
+        candidates=[],
+    )
+    legacy_path = store_root / "job-legacy.json"
+    legacy_path.write_text(job.model_dump_json())
+
+    routes_jobs._load_jobs_from_disk()
+    assert "job-legacy" in routes_jobs._jobs
+    assert not legacy_path.exists()
+
+    _reset_state()
+    routes_jobs._load_jobs_from_disk()
+    assert "job-legacy" in routes_jobs._jobs
+
+
+def test_deferred_job_updates_are_flushed(tmp_path: Path):
+    store_root = tmp_path / "jobs"
+    store_root.mkdir(parents=True, exist_ok=True)
+    routes_jobs._job_store_root = store_root
+    _reset_state()
+
+    job = Job(
+        id="job-running",
+        status=JobStatus.DONE,
+        created_at=datetime(2024, 1, 1),
+        candidates=[],
+    )
+    routes_jobs._set_job(job)
+    running = Job(
+        id="job-running",
+        status=JobStatus.RUNNING,
+        created_at=datetime(2024, 1, 1),
+        candidates=[],
+    )
+    routes_jobs._set_job(running, persist=False)
+    routes_jobs._flush_dirty_jobs()
+
+    stored = job_store.load_jobs(store_root)
+    assert [payload["status"] for payload in stored] == ["RUNNING"]
+
+
+def test_job_store_batches_saves_and_deletes(tmp_path: Path):
+    store_root = tmp_path / "jobs"
+    records = [
+        (f"job-{idx}", float(idx), {"id": f"job-{idx}"}, [{"kind": "preview"}]) for idx in range(3)
+    ]
+    job_store.save_jobs(store_root, records)
+    job_store.save_jobs(store_root, [("job-0", 0.0, {"id": "job-0", "n": 1}, None)])
+
+    stored = job_store.load_jobs(store_root)
+    assert [payload["id"] for payload in stored] == ["job-0", "job-1", "job-2"]
+    assert stored[0]["n"] == 1
+    assert stored[0]["mix_history"] == [{"kind": "preview"}]
+
+    assert job_store.delete_jobs(store_root, ["job-0", "job-2", "missing"]) == 2
+    assert [payload["id"] for payload in job_store.load_jobs(store_root)] == ["job-1"]
+
+
+def test_load_jobs_hydrates_upload_paths(tmp_path: Path):
+    store_root = tmp_path / "jobs"
+    upload_root = tmp_path / "uploads"
+    store_root.mkdir(parents=True, exist_ok=True)
+    routes_jobs._job_store_root = store_root
+    routes_jobs._upload_root = upload_root
+    _reset_state()
+
+    for job_id in ("job-mp3", "job-missing"):
+        routes_jobs._set_job(
+            Job(id=job_id, status=JobStatus.DONE, created_at=datetime(2024, 1, 1), candidates=[])
+        )
+    upload_dir = upload_root / "job-mp3"
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    (upload_dir / "input.wav").write_text("fake")
+    (upload_dir / "input.mp3").write_text("fake")
+
+    _reset_state()
+    routes_jobs._load_jobs_from_disk()
+    assert set(routes_jobs._jobs) == {"job-mp3", "job-missing"}
+    assert routes_jobs._job_files["job-mp3"]["input"] == upload_dir / "input.mp3"
+    assert routes_jobs._job_files["job-mp3"]["wav"] == upload_dir / "input.wav"
+    assert "job-missing" not in routes_jobs._job_files
+
+
+def test_purge_job_files_renames_then_removes_trees(tmp_path: Path):
+    upload_root = tmp_path / "uploads"
+    output_root = tmp_path / "outputs"
+    routes_jobs._upload_root = upload_root
+    routes_jobs._output_root = output_root
+
+    job_id = "job-purge"
+    nested = output_root / job_id / "nested"
+    nested.mkdir(parents=True, exist_ok=True)
+    (nested / "output.wav").write_text("fake")
+    (upload_root / job_id).mkdir(parents=True, exist_ok=True)
+    (upload_root / job_id / "input.wav").write_text("fake")
+
+    trash = routes_jobs._purge_job_files(job_id)
+    assert len(trash) == 2
+    assert not (upload_root / job_id).exists()
+    assert not (output_root / job_id).exists()
+    assert all(path.exists() for path in trash)
+
+    routes_jobs._remove_trees(trash)
+    assert not any(path.exists() for path in trash)
+    assert list(upload_root.iterdir()) == []
+    assert list(output_root.iterdir()) == []
+
+
+def test_mix_status_uses_last_mix_without_state(tmp_path: Path, monkeypatch):
+    store_root = tmp_path / "jobs"
+    output_root = tmp_path / "outputs"
+    store_root.mkdir(parents=True, exist_ok=True)
+    routes_jobs._job_store_root = store_root
+    routes_jobs._output_root = output_root
+    _reset_state()
+
+    job_id = "job-status"
+    output_dir = output_root / job_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "output-old.wav").write_text("fake")
+    (output_dir / "output-new.wav").write_text("fake")
+    summary = JobMixSummary(kind="full", output_name="output-new.wav", updated_at=datetime.utcnow())
+    routes_jobs._set_job(
+        Job(
+            id=job_id,
+            status=JobStatus.DONE,
+            created_at=datetime.utcnow(),
+            candidates=[],
+            last_mix=summary,
+            mix_history=[summary],
+        )
+    )
+
+    def _no_scan(_job_id):
+        raise AssertionError("output dir should not be scanned")
+
+    monkeypatch.setattr(routes_jobs, "_latest_output_file", _no_scan)
+    response = routes_jobs.get_mix_status(job_id)
+    assert response.status == JobStatus.DONE
+    assert response.output_url == f"/assets/{job_id}/output?name=output-new.wav"
+
+
+def test_queued_mix_can_be_cancelled(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(routes_jobs, "_mix_executor", executor)
+    release = threading.Event()
+    ran: list[str] = []
+
+    routes_jobs._submit_mix("job-busy", release.wait)
+    routes_jobs._submit_mix("job-queued", lambda: ran.append("job-queued"))
+    routes_jobs._cancel_queued_mix("job-queued")
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert ran == []
+    assert routes_jobs._mix_futures == {}
+
+
+def test_job_store_backfills_updated_at_and_loads_via_index(tmp_path: Path):
+    store_root = tmp_path / "jobs"
+    store_root.mkdir()
+    legacy = sqlite3.connect(job_store.db_path(store_root))
+    legacy.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, payload BLOB NOT NULL, created_at REAL NOT NULL)"
+    )
+    legacy.executemany(
+        "INSERT INTO jobs (id, payload, created_at) VALUES (?, ?, ?)",
+        [
+            ("job-a", json.dumps({"status": "DONE", "updated_at": "2024-01-02T00:00:00"}), 1.0),
+            ("job-b", json.dumps({"status": "RUNNING", "updated_at": "not-a-date"}), 2.0),
+        ],
+    )
+    legacy.commit()
+    legacy.close()
+
+    job_store.save_jobs(
+        store_root,
+        [("job-c", 3.0, {"status": JobStatus.DONE, "updated_at": datetime(2024, 1, 3)}, None)],
+    )
+
+    conn = sqlite3.connect(job_store.db_path(store_root))
+    rows = conn.execute("SELECT id, updated_at FROM jobs ORDER BY id").fetchall()
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id, payload FROM jobs ORDER BY updated_at"
+    ).fetchall()
+    conn.close()
+    assert rows == [
+        ("job-a", datetime(2024, 1, 2).timestamp()),
+        ("job-b", 2.0),
+        ("job-c", datetime(2024, 1, 3).timestamp()),
+    ]
+    assert any("ix_jobs_updated" in row[-1] for row in plan)
+    loaded = [payload["status"] for payload in job_store.load_jobs(store_root)]
+    assert loaded == ["RUNNING", "DONE", "DONE"]
+
+
+def test_mix_worker_count_treats_non_positive_as_auto(monkeypatch):
+    monkeypatch.setattr(routes_jobs.os, "cpu_count", lambda: 4)
+    assert routes_jobs._mix_worker_count(2) == 2
+    assert routes_jobs._mix_worker_count(0) == 3
+    assert routes_jobs._mix_worker_count(-1) == 3
@@ -1,6 +1,15 @@
 import numpy as np
 
-from app.core.mixing import apply_gain, limiter, mix_tracks, peak_normalize
+from app.core import mixing
+from app.core.mixing import (
+    apply_gain,
+    apply_gain_limit,
+    limiter,
+    mix_tracks,
+    normalize_chain,
+    peak_abs,
+    peak_normalize,
+)
 
 
 def test_mixing_gain_and_normalize():
@@ -22,3 +31,72 @@ def test_mix_tracks_padding():
     assert mixed.shape[0] == 5
     assert np.allclose(mixed[:3], np.array([3, 3, 3], dtype=np.float32))
     assert np.allclose(mixed[3:], np.array([2, 2], dtype=np.float32))
+
+
+def test_mix_tracks_accepts_float64_tracks():
+    a = np.full(4, 0.25, dtype=np.float64)
+    b = np.full(2, 0.5, dtype=np.float32)
+    mixed = mix_tracks([a, b])
+    assert mixed.dtype == np.float32
+    assert np.allclose(mixed, np.array([0.75, 0.75, 0.25, 0.25], dtype=np.float32))
+
+
+def test_mix_tracks_does_not_alias_inputs():
+    a = np.ones(4, dtype=np.float32)
+    b = np.ones(2, dtype=np.float32)
+    mixed = mix_tracks([b, a])
+    mixed[:] = 0.0
+    assert np.all(a == 1.0)
+    assert mix_tracks([a]) is not a
+
+
+def test_mixing_keeps_float32_and_limits_in_place():
+    audio = np.array([0.5, -2.0, 1.5], dtype=np.float32)
+    assert apply_gain(audio, 0.5).dtype == np.float32
+    assert peak_normalize(audio).dtype == np.float32
+    limited = limiter(audio, threshold=0.9, out=audio)
+    assert limited is audio
+    assert limited.dtype == np.float32
+    assert np.allclose(audio, np.array([0.5, -0.9, 0.9], dtype=np.float32))
+
+
+def test_normalize_chain_matches_separate_stages():
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.6, 0.6, 4096).astype(np.float32)
+    for gain in (1.0, 0.25, 3.0, -2.0):
+        expected = limiter(peak_normalize(apply_gain(audio, gain)))
+        np.testing.assert_allclose(normalize_chain(audio, gain), expected, atol=1e-6)
+    assert not normalize_chain(np.zeros(8, dtype=np.float32)).any()
+    hot = normalize_chain(audio, target_peak=1.5, threshold=0.99)
+    assert float(np.max(np.abs(hot))) <= np.float32(0.99)
+
+
+def test_apply_gain_limit_matches_gain_then_limiter():
+    audio = np.array([0.5, -0.6, 0.2, 0.0], dtype=np.float32)
+    expected = limiter(apply_gain(audio, 1.8), threshold=0.9)
+    assert np.array_equal(apply_gain_limit(audio, 1.8, threshold=0.9), expected)
+    result = apply_gain_limit(audio, 1.8, threshold=0.9, out=audio)
+    assert result is audio
+    assert np.array_equal(audio, expected)
+
+
+def test_kernel_path_matches_numpy(monkeypatch):
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-1.5, 1.5, size=(2, 64)).astype(np.float32)
+    expected = (
+        peak_abs(audio),
+        limiter(audio, threshold=0.7),
+        normalize_chain(audio, gain=-2.0),
+        normalize_chain(audio, target_peak=1.2, threshold=0.9),
+        apply_gain_limit(audio, 0.8, threshold=0.6),
+    )
+    # The plain-Python loops stand in for their numba-compiled versions.
+    monkeypatch.setattr(mixing, "_KERNELS", (mixing._peak_abs_loop, mixing._scale_clip_loop))
+    assert peak_abs(audio) == expected[0]
+    assert np.array_equal(limiter(audio, threshold=0.7), expected[1])
+    assert np.array_equal(normalize_chain(audio, gain=-2.0), expected[2])
+    assert np.array_equal(apply_gain_limit(audio, 0.8, threshold=0.6), expected[4])
+    buffer = audio.copy()
+    result = normalize_chain(buffer, target_peak=1.2, threshold=0.9, out=buffer)
+    assert result is buffer
+    assert np.array_equal(buffer, expected[3])
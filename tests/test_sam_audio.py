@@ -0,0 +1,109 @@
+import contextlib
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.worker.models import sam_audio
+
+
+class _Tensor:
+    # Just enough of torch.Tensor for _run_sam_audio_inference on CPU.
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = array
+
+    @property
+    def ndim(self) -> int:
+        return self.array.ndim
+
+    @property
+    def shape(self) -> tuple:
+        return self.array.shape
+
+    def __getitem__(self, index) -> "_Tensor":
+        return _Tensor(self.array[index])
+
+    def unsqueeze(self, dim: int) -> "_Tensor":
+        return _Tensor(np.expand_dims(self.array, dim))
+
+    def float(self) -> "_Tensor":
+        return self
+
+    def mean(self, dim: int) -> "_Tensor":
+        return _Tensor(self.array.mean(axis=dim))
+
+    def detach(self) -> "_Tensor":
+        return self
+
+    def cpu(self) -> "_Tensor":
+        return self
+
+    def numpy(self) -> np.ndarray:
+        return self.array
+
+
+def _stub_inference(monkeypatch: pytest.MonkeyPatch, autocast_mode: str):
+    monkeypatch.setenv("SAM_AUDIO_AUTOCAST", autocast_mode)
+    monkeypatch.setattr(sam_audio, "_TORCHAUDIO", False)
+    sam_audio._inference_options.cache_clear()
+    autocast_calls: list[dict] = []
+    received: list[_Tensor] = []
+
+    def _autocast(**kwargs):
+        autocast_calls.append(kwargs)
+        return contextlib.nullcontext()
+
+    torch = SimpleNamespace(
+        from_numpy=_Tensor,
+        inference_mode=contextlib.nullcontext,
+        autocast=_autocast,
+        float16="float16",
+        bfloat16="bfloat16",
+    )
+
+    class _Processor:
+        audio_sampling_rate = 8000
+
+        def __call__(self, descriptions, audios):
+            received.extend(audios)
+            return SimpleNamespace(to=lambda _device: SimpleNamespace(audio=audios[0]))
+
+    class _Model:
+        def separate(self, batch, predict_spans, reranking_candidates):
+            wave = batch.audio
+            return SimpleNamespace(target=[wave], residual=[_Tensor(wave.array * 0)])
+
+    def run(audio: np.ndarray, device: str = "mps"):
+        return sam_audio._run_sam_audio_inference(
+            audio, 8000, "sound", _Model(), _Processor(), device, torch
+        )
+
+    return run, autocast_calls, received
+
+
+def test_autocast_is_not_entered_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    run, autocast_calls, _ = _stub_inference(monkeypatch, "auto")
+    audio = np.linspace(-0.5, 0.5, 400, dtype=np.float32)
+    try:
+        target, residual = run(audio)
+        assert autocast_calls == []
+        np.testing.assert_array_equal(target, audio)
+        assert not residual.any()
+
+        monkeypatch.setenv("SAM_AUDIO_AUTOCAST", "true")
+        sam_audio._inference_options.cache_clear()
+        run(audio)
+        assert autocast_calls == [{"device_type": "mps", "dtype": "float16"}]
+    finally:
+        sam_audio._inference_options.cache_clear()
+
+
+def test_read_only_input_reaches_processor_without_copy(monkeypatch: pytest.MonkeyPatch) -> None:
+    run, _, received = _stub_inference(monkeypatch, "false")
+    audio = np.linspace(-0.5, 0.5, 400, dtype=np.float32)
+    audio.setflags(write=False)
+    try:
+        run(audio)
+    finally:
+        sam_audio._inference_options.cache_clear()
+    assert np.shares_memory(received[0].array, audio)
@@ -1,6 +1,13 @@
 import numpy as np
 
-from app.core.segments import merge_segments, segments_from_scores
+from app.core import segments as segments_module
+from app.core.segments import (
+    Segment,
+    merge_segment_arrays,
+    merge_segments,
+    segments_from_scores,
+    segments_from_scores_batched,
+)
 
 
 def test_segments_from_scores_and_merge_gap():
@@ -15,3 +22,69 @@ def test_segments_from_scores_and_merge_gap():
     assert len(merged) == 2
     assert merged[0].start == 0.1
     assert merged[0].end == 0.6
+
+
+def test_segments_from_scores_runs_at_edges():
+    times = np.arange(0.0, 0.6, 0.1)
+    scores = np.array([0.9, 0.7, 0.1, 0.2, 0.6, 0.95])
+    segments = segments_from_scores(times, scores, threshold=0.5, merge_gap=0.0)
+    assert [(round(seg.start, 2), round(seg.end, 2)) for seg in segments] == [
+        (0.0, 0.2),
+        (0.4, 0.6),
+    ]
+    assert [seg.score for seg in segments] == [0.9, 0.95]
+
+
+def test_segments_from_scores_batched_matches_per_column():
+    rng = np.random.default_rng(7)
+    times = np.arange(40) * 0.25
+    scores = rng.random((40, 4))
+    scores[:, 2] = 0.0
+    batched = segments_from_scores_batched(times, scores, threshold=0.6, merge_gap=0.3)
+    for col in range(scores.shape[1]):
+        assert batched[col] == segments_from_scores(
+            times, scores[:, col], threshold=0.6, merge_gap=0.3
+        )
+    assert batched[2] == []
+
+
+def test_packed_run_bounds_match_diff(monkeypatch):
+    rng = np.random.default_rng(11)
+    times = np.arange(5000) * 0.01
+    scores = rng.random(5000)
+    scores[-3:] = 1.0
+    expected = segments_from_scores(times, scores, threshold=0.7, merge_gap=0.0)
+    monkeypatch.setattr(segments_module, "_PACKED_MIN_FRAMES", 10**9)
+    assert segments_from_scores(times, scores, threshold=0.7, merge_gap=0.0) == expected
+    assert expected[-1].end > times[-1]
+
+
+def test_merge_segment_arrays_matches_merge_segments():
+    starts = np.array([0.5, 0.0, 0.25, 1.0])
+    ends = np.array([0.6, 0.3, 0.45, 1.2])
+    scores = np.array([0.4, 0.9, 0.2, 0.7])
+    merged = merge_segments(
+        [Segment(float(s), float(e), float(c)) for s, e, c in zip(starts, ends, scores)],
+        merge_gap=0.1,
+    )
+    out_starts, out_ends, out_scores = merge_segment_arrays(starts, ends, scores, 0.1)
+    assert [(seg.start, seg.end, seg.score) for seg in merged] == list(
+        zip(out_starts.tolist(), out_ends.tolist(), out_scores.tolist())
+    )
+
+
+def test_merge_segments_matches_sequential_merge():
+    rng = np.random.default_rng(5)
+    starts = rng.uniform(0.0, 50.0, 200)
+    segments = [
+        Segment(start=float(start), end=float(start + length), score=float(score))
+        for start, length, score in zip(starts, rng.uniform(0.0, 1.0, 200), rng.random(200))
+    ]
+    expected: list[Segment] = []
+    for seg in sorted(segments, key=lambda seg: seg.start):
+        if expected and seg.start - expected[-1].end <= 0.3:
+            last = expected[-1]
+            expected[-1] = Segment(last.start, max(last.end, seg.end), max(last.score, seg.score))
+        else:
+            expected.append(seg)
+    assert merge_segments(segments, merge_gap=0.3) == expected
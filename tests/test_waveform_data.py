@@ -1,13 +1,10 @@
-import numpy as np
-
 from app.worker import tasks
 
 
-def test_energy_candidates_have_segments_within_duration():
+def test_energy_candidates_have_segments_within_duration(sine_tone):
     sr = 8000
     duration = 2.0
-    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    audio = (0.5 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
+    audio = sine_tone(sr, duration, amp=0.5)
 
     candidates = tasks.build_candidates(audio, sr, top_n=1, use_yamnet=False)
     assert candidates
@@ -1,123 +1,511 @@
-import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 import numpy as np
 import pytest
 
-from app.core import audio_io
-from app.core.hash_cache import cache_path, hash_file
+from app.core import audio_io, hash_cache
+from app.core.hash_cache import cache_path, fingerprint_settings, hash_file
 from app.worker import tasks
 
 
-def test_process_job_cache_hit(monkeypatch: pytest.MonkeyPatch) -> None:
-    if not audio_io.dependencies_ok():
-        pytest.skip("audio_io dependencies missing")
+@pytest.mark.requires_audio
+def test_process_job_cache_hit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sine_tone) -> None:
     sr = 8000
     duration = 0.4
-    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    audio = (0.2 * np.sin(2 * np.pi * 330.0 * t)).astype(np.float32)
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        input_path = tmpdir_path / "input.wav"
-        output_path = tmpdir_path / "output.wav"
-        cache_dir = tmpdir_path / "cache"
-        audio_io.write_audio(input_path, audio, sr)
-
-        def _fake_separate_prompt(
-            audio_chunk: np.ndarray, _sr: int, _prompt: str, job_id: str | None = None
-        ) -> tuple[np.ndarray, np.ndarray]:
-            _ = job_id
-            return audio_chunk, np.zeros_like(audio_chunk)
-
-        monkeypatch.setattr(tasks, "separate_prompt", _fake_separate_prompt)
-
-        tasks.process_job(
-            input_path,
-            output_path,
-            prompts=["sound"],
-            gains=[1.0],
-            mode="keep",
-            target_sr=sr,
-            cache_dir=cache_dir,
-        )
+    audio = sine_tone(sr, duration, freq=330.0)
+
+    input_path = tmp_path / "input.wav"
+    output_path = tmp_path / "output.wav"
+    cache_dir = tmp_path / "cache"
+    audio_io.write_audio(input_path, audio, sr)
+
+    def _fake_separate_prompt(
+        audio_chunk: np.ndarray, _sr: int, _prompt: str, job_id: str | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        _ = job_id
+        return audio_chunk, np.zeros_like(audio_chunk)
+
+    monkeypatch.setattr(tasks, "separate_prompt", _fake_separate_prompt)
+
+    tasks.process_job(
+        input_path,
+        output_path,
+        prompts=["sound"],
+        gains=[1.0],
+        mode="keep",
+        target_sr=sr,
+        cache_dir=cache_dir,
+    )
+
+    audio_hash = hash_file(input_path)
+
+    def _no_rehash(_path):
+        raise AssertionError("indexed digest should be reused")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(hash_cache, "hash_file", _no_rehash)
+        assert hash_cache.hash_file_cached(input_path, cache_dir) == audio_hash
+
+    chunk_seconds, chunk_overlap = tasks._resolve_chunk_settings(None)
+    settings_hash = tasks.build_settings_fingerprint(
+        ("sound",),
+        (1.0,),
+        "keep",
+        sr,
+        chunk_seconds=chunk_seconds,
+        chunk_overlap=chunk_overlap,
+    )
+    cached = cache_path(cache_dir, audio_hash, settings_hash, suffix=".wav")
+    assert cached.exists()
+
+    def _fail(*_args, **_kwargs):
+        raise RuntimeError("run_separation should not be called on cache hit")
+
+    output_path_2 = tmp_path / "output2.wav"
+    tasks.process_job(
+        input_path,
+        output_path_2,
+        prompts=["sound"],
+        gains=[1.0],
+        mode="keep",
+        target_sr=sr,
+        cache_dir=cache_dir,
+        _separation_fn=_fail,
+    )
+
+    assert output_path_2.exists()
+    # Output and cache share the written file instead of a second copy.
+    assert output_path.samefile(cached)
+
+    # Rewriting an output never touches the cache entry it was linked to.
+    cached_bytes = cached.read_bytes()
+    tasks.process_job(
+        input_path,
+        output_path,
+        prompts=["sound"],
+        gains=[1.0],
+        mode="keep",
+        target_sr=sr,
+        _separation_fn=lambda audio, *_a, **_k: audio * 0.5,
+    )
+    assert not output_path.samefile(cached)
+    assert cached.read_bytes() == cached_bytes
+
+
+@pytest.mark.requires_audio
+def test_process_job_chunked(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sine_tone) -> None:
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_SECONDS", "0.5")
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_OVERLAP", "0.1")
+    sr = 8000
+    duration = 1.2
+    audio = sine_tone(sr, duration)
+
+    input_path = tmp_path / "input.wav"
+    output_path = tmp_path / "output.wav"
+    audio_io.write_audio(input_path, audio, sr)
+
+    calls: list[int] = []
+
+    def _fake_run_separation(
+        audio_chunk: np.ndarray,
+        _sr: int,
+        _prompts: list[str],
+        _gains: list[float],
+        mode: str = "keep",
+        job_id: str | None = None,
+        normalize: bool = True,
+    ) -> np.ndarray:
+        _ = mode
+        _ = job_id
+        calls.append(audio_chunk.shape[0])
+        return audio_chunk
+
+    tasks.process_job(
+        input_path,
+        output_path,
+        prompts=["sound"],
+        gains=[1.0],
+        mode="keep",
+        target_sr=sr,
+        _separation_fn=_fake_run_separation,
+    )
+
+    assert output_path.exists()
+    out_audio, out_sr = audio_io.read_audio(output_path, target_sr=sr, mono=True)
+    assert out_sr == sr
+    assert out_audio.shape[0] == audio.shape[0]
+    assert len(calls) >= 2
 
-        audio_hash = hash_file(input_path)
-        chunk_seconds, chunk_overlap = tasks._resolve_chunk_settings(None)
-        settings_hash = tasks.build_settings_fingerprint(
+
+@pytest.mark.requires_audio
+def test_streamed_chunked_output_matches_in_memory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sine_tone
+) -> None:
+    sr = 8000
+    audio = sine_tone(sr, 2.3, freq=330.0, amp=1.5)
+
+    def _fake_run_separation(
+        audio_chunk, _sr, _prompts, _gains, mode="keep", job_id=None, normalize=True
+    ):
+        return audio_chunk * 0.8
+
+    kwargs = dict(chunk_seconds=0.5, overlap_seconds=0.1, separation_fn=_fake_run_separation)
+    expected = tasks.run_separation_chunked(audio, sr, ["sound"], [1.0], "keep", **kwargs)
+
+    output_path = tmp_path / "output.wav"
+    tasks._write_separation_chunked(output_path, audio, sr, ["sound"], [1.0], "keep", **kwargs)
+    streamed, _ = audio_io.read_audio(output_path, mono=True)
+    assert not output_path.with_suffix(".partial").exists()
+
+    # Same result when the input is also read chunk by chunk from disk.
+    input_path = tmp_path / "input.wav"
+    audio_io.write_audio(input_path, audio, sr)
+    frames = audio_io.open_audio_frames(input_path, target_sr=sr)
+    tasks._write_separation_chunked(output_path, frames, sr, ["sound"], [1.0], "keep", **kwargs)
+    from_disk, _ = audio_io.read_audio(output_path, mono=True)
+    np.testing.assert_array_equal(from_disk, streamed)
+
+    # Unmappable outputs fall back to the two-pass scratch writer.
+    def _no_mmap(*_args, **_kwargs):
+        raise OSError("mmap unsupported")
+
+    monkeypatch.setattr(tasks, "create_float_wav", _no_mmap)
+    tasks._write_separation_chunked(output_path, audio, sr, ["sound"], [1.0], "keep", **kwargs)
+    two_pass, _ = audio_io.read_audio(output_path, mono=True)
+    assert not output_path.with_suffix(".partial").exists()
+    np.testing.assert_array_equal(two_pass, streamed)
+
+    assert streamed.shape == expected.shape
+    assert np.max(np.abs(streamed - expected)) < 1e-3
+
+
+@pytest.mark.requires_audio
+def test_streamed_chunked_output_only_replaces_finished_file(tmp_path: Path, sine_tone) -> None:
+    sr = 8000
+    audio = sine_tone(sr, 2.3, freq=330.0)
+    output_path = tmp_path / "output.wav"
+    output_path.write_bytes(b"previous")
+    calls: list[int] = []
+
+    def _failing_run_separation(
+        audio_chunk, _sr, _prompts, _gains, mode="keep", job_id=None, normalize=True
+    ):
+        assert output_path.read_bytes() == b"previous"
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("boom")
+        return audio_chunk
+
+    with pytest.raises(RuntimeError, match="boom"):
+        tasks._write_separation_chunked(
+            output_path,
+            audio,
+            sr,
             ["sound"],
             [1.0],
             "keep",
-            sr,
-            chunk_seconds=chunk_seconds,
-            chunk_overlap=chunk_overlap,
+            chunk_seconds=0.5,
+            overlap_seconds=0.1,
+            separation_fn=_failing_run_separation,
         )
-        cached = cache_path(cache_dir, audio_hash, settings_hash, suffix=".wav")
-        assert cached.exists()
-
-        def _fail(*_args, **_kwargs):
-            raise RuntimeError("run_separation should not be called on cache hit")
-
-        monkeypatch.setattr(tasks, "run_separation", _fail)
-
-        output_path_2 = tmpdir_path / "output2.wav"
-        tasks.process_job(
-            input_path,
-            output_path_2,
-            prompts=["sound"],
-            gains=[1.0],
-            mode="keep",
-            target_sr=sr,
-            cache_dir=cache_dir,
+
+    assert output_path.read_bytes() == b"previous"
+    assert not output_path.with_suffix(".partial").exists()
+
+
+@pytest.mark.requires_audio
+def test_parallel_chunk_workers_match_serial(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    sr = 8000
+    audio = np.random.default_rng(1).uniform(-0.5, 0.5, int(sr * 3.1)).astype(np.float32)
+    seen: list[int] = []
+
+    def _fake_run_separation(
+        audio_chunk, _sr, _prompts, _gains, mode="keep", job_id=None, normalize=True
+    ):
+        seen.append(audio_chunk.shape[0])
+        return audio_chunk * 0.5
+
+    kwargs = dict(chunk_seconds=0.5, overlap_seconds=0.1, separation_fn=_fake_run_separation)
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_WORKERS", "1")
+    serial = tasks.run_separation_chunked(audio, sr, ["sound"], [1.0], "keep", **kwargs)
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_WORKERS", "3")
+    parallel = tasks.run_separation_chunked(
+        audio,
+        sr,
+        ["sound"],
+        [1.0],
+        "keep",
+        cache_dir=tmp_path,
+        audio_hash="a" * 8,
+        settings_hash="b" * 8,
+        **kwargs,
+    )
+    np.testing.assert_array_equal(serial, parallel)
+    assert len(list((tmp_path / "chunks").rglob("chunk-*.wav"))) == len(seen) // 2
+
+    seen.clear()
+    cached = tasks.run_separation_chunked(
+        audio,
+        sr,
+        ["sound"],
+        [1.0],
+        "keep",
+        cache_dir=tmp_path,
+        audio_hash="a" * 8,
+        settings_hash="b" * 8,
+        **kwargs,
+    )
+    assert not seen
+    # Cached chunks are 16-bit PCM, so reruns match to within quantization.
+    assert np.max(np.abs(cached - serial)) < 1e-4
+
+
+def test_serial_chunks_prefetch_next_input(monkeypatch: pytest.MonkeyPatch) -> None:
+    sr = 8000
+    audio = np.random.default_rng(3).uniform(-0.5, 0.5, sr * 2).astype(np.float32)
+    next_loaded = threading.Event()
+    ranges = tasks._build_chunk_ranges(audio.shape[0], sr // 2, 0)
+    separated: list[int] = []
+
+    class _Source:
+        shape = audio.shape
+
+        def __getitem__(self, key):
+            if key.start:
+                next_loaded.set()
+            return audio[key]
+
+    def _fake_run_separation(
+        audio_chunk, _sr, _prompts, _gains, mode="keep", job_id=None, normalize=True
+    ):
+        # The following chunk is read while this one is still "on the model".
+        if len(separated) < len(ranges) - 1:
+            assert next_loaded.wait(timeout=5)
+            next_loaded.clear()
+        separated.append(audio_chunk.shape[0])
+        return audio_chunk
+
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_WORKERS", "1")
+    outputs = list(
+        tasks._iter_chunk_outputs(
+            _Source(), sr, ranges, ["sound"], [1.0], "keep", separation_fn=_fake_run_separation
         )
+    )
+    assert len(outputs) == len(ranges) == 4
 
-        assert output_path_2.exists()
+    calls = iter([False, True])
+    with pytest.raises(tasks.CancelledError):
+        list(
+            tasks._iter_chunk_outputs(
+                audio,
+                sr,
+                ranges,
+                ["sound"],
+                [1.0],
+                "keep",
+                should_cancel=lambda: next(calls),
+                separation_fn=_fake_run_separation,
+            )
+        )
 
 
-def test_process_job_chunked(monkeypatch: pytest.MonkeyPatch) -> None:
-    if not audio_io.dependencies_ok():
-        pytest.skip("audio_io dependencies missing")
-    monkeypatch.setenv("SAM_AUDIO_CHUNK_SECONDS", "0.5")
-    monkeypatch.setenv("SAM_AUDIO_CHUNK_OVERLAP", "0.1")
+@pytest.mark.requires_audio
+def test_chunk_cache_validates_sidecar_before_decoding(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
     sr = 8000
-    duration = 1.2
-    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    audio = (0.2 * np.sin(2 * np.pi * 220.0 * t)).astype(np.float32)
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        input_path = tmpdir_path / "input.wav"
-        output_path = tmpdir_path / "output.wav"
-        audio_io.write_audio(input_path, audio, sr)
-
-        calls: list[int] = []
-
-        def _fake_run_separation(
-            audio_chunk: np.ndarray,
-            _sr: int,
-            _prompts: list[str],
-            _gains: list[float],
-            mode: str = "keep",
-            job_id: str | None = None,
-        ) -> np.ndarray:
-            _ = mode
-            _ = job_id
-            calls.append(audio_chunk.shape[0])
-            return audio_chunk
-
-        monkeypatch.setattr(tasks, "run_separation", _fake_run_separation)
-
-        tasks.process_job(
-            input_path,
-            output_path,
-            prompts=["sound"],
-            gains=[1.0],
-            mode="keep",
-            target_sr=sr,
+    chunk = np.linspace(-0.5, 0.5, 400, dtype=np.float32)
+    path = tmp_path / "chunk-0-400.wav"
+    tasks._write_cached_chunk(path, chunk, sr)
+    restored = tasks._load_cached_chunk(path, 400, sr)
+    np.testing.assert_allclose(restored, chunk, atol=0.5 / 32768)
+    assert path.stat().st_size < chunk.nbytes
+
+    # Unnormalized chunks above full scale survive the 16-bit round trip.
+    loud = chunk * np.float32(6.0)
+    tasks._write_cached_chunk(path, loud, sr)
+    np.testing.assert_allclose(tasks._load_cached_chunk(path, 400, sr), loud, atol=3.0 / 32768)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("stale chunk should not be decoded")
+
+    monkeypatch.setattr(tasks, "read_audio_frames", _fail)
+    assert tasks._load_cached_chunk(path, 500, sr) is None
+    assert tasks._load_cached_chunk(path, 400, 16000) is None
+    tasks._chunk_meta_path(path).unlink()
+    assert tasks._load_cached_chunk(path, 400, sr) is None
+
+
+def test_hash_file_matches_streaming_digest(tmp_path: Path) -> None:
+    for name, data in (("empty.bin", b""), ("data.bin", b"sam-audio" * 100_000)):
+        path = tmp_path / name
+        path.write_bytes(data)
+        if hash_cache.blake3 is not None:
+            expected = hash_cache.blake3(data).hexdigest()
+        else:
+            expected = hashlib.sha256(data).hexdigest()
+        assert hash_file(path) == expected
+        assert len(expected) == 64
+
+
+def test_hash_file_cached_skips_unchanged_files(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(hash_cache, "_hash_index", OrderedDict())
+    monkeypatch.setattr(hash_cache, "_loaded_indexes", set())
+    path = tmp_path / "input.wav"
+    path.write_bytes(b"first")
+    cache_dir = tmp_path / "cache"
+    digest = hash_cache.hash_file_cached(path, cache_dir)
+    assert digest == hash_file(path)
+    assert (cache_dir / hash_cache.HASH_INDEX_NAME).exists()
+
+    # A fresh process reads the persisted index instead of hashing again.
+    monkeypatch.setattr(hash_cache, "_hash_index", OrderedDict())
+    monkeypatch.setattr(hash_cache, "_loaded_indexes", set())
+    real_hash_file = hash_cache.hash_file
+
+    def _fail(_path):
+        raise AssertionError("unexpected rehash")
+
+    monkeypatch.setattr(hash_cache, "hash_file", _fail)
+    assert hash_cache.hash_file_cached(path, cache_dir) == digest
+
+    monkeypatch.setattr(hash_cache, "hash_file", real_hash_file)
+    path.write_bytes(b"second version")
+    assert hash_cache.hash_file_cached(path, cache_dir) == hash_file(path) != digest
+
+
+def test_hash_file_cached_evicts_least_recently_used(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(hash_cache, "_hash_index", OrderedDict())
+    monkeypatch.setattr(hash_cache, "_HASH_INDEX_MAX_ENTRIES", 2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(str(path.resolve()))
+    hash_cache.hash_file_cached(paths[0])
+    hash_cache.hash_file_cached(paths[1])
+    hash_cache.hash_file_cached(paths[0])
+    hash_cache.hash_file_cached(paths[2])
+    assert list(hash_cache._hash_index) == [paths[0], paths[2]]
+
+
+def test_fingerprint_settings_is_stable_and_type_aware() -> None:
+    settings = {"prompts": ["drums"], "gains": [1.0], "mode": "keep", "target_sr": None}
+    reordered = {"mode": "keep", "target_sr": None, "gains": [1.0], "prompts": ["drums"]}
+    assert fingerprint_settings(settings) == fingerprint_settings(reordered)
+    assert fingerprint_settings({"gains": [1]}) != fingerprint_settings({"gains": [1.0]})
+
+
+def test_chunk_crossfade_preserves_constant_and_silence(monkeypatch: pytest.MonkeyPatch) -> None:
+    sr = 8000
+
+    def identity(audio_chunk, *_args, **_kwargs):
+        return audio_chunk
+
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_WORKERS", "1")
+    chunk_samples, overlap_samples = tasks._chunk_layout(sr, 0.5, 0.1)
+    for total in (int(sr * 2.3), int(sr * 2.0) + 1):
+        constant = np.full(total, 0.5, dtype=np.float32)
+        blocks = [
+            block.copy()
+            for block in tasks._iter_separated_blocks(
+                constant,
+                sr,
+                ["sound"],
+                [1.0],
+                "keep",
+                chunk_samples,
+                overlap_samples,
+                separation_fn=identity,
+            )
+        ]
+        merged = np.concatenate(blocks)
+        assert merged.shape == constant.shape
+        np.testing.assert_allclose(merged, constant, atol=1e-6)
+
+        silence = np.zeros(total, dtype=np.float32)
+        out = tasks.run_separation_chunked(
+            silence,
+            sr,
+            ["sound"],
+            [1.0],
+            "keep",
+            chunk_seconds=0.5,
+            overlap_seconds=0.1,
+            separation_fn=identity,
         )
+        assert out.shape == silence.shape
+        assert not out.any()
+
+
+def test_build_settings_fingerprint_is_memoized() -> None:
+    args = (("drums", "vocals"), (1.0, 0.5), "keep", 48000)
+    first = tasks.build_settings_fingerprint(*args, chunk_seconds=30.0)
+    hits = tasks.build_settings_fingerprint.cache_info().hits
+    assert tasks.build_settings_fingerprint(*args, chunk_seconds=30.0) == first
+    assert tasks.build_settings_fingerprint.cache_info().hits == hits + 1
+    assert tasks.build_settings_fingerprint(*args, chunk_seconds=30) != first
+
+
+def test_chunked_separation_normalizes_once(monkeypatch: pytest.MonkeyPatch, sine_tone) -> None:
+    sr = 8000
+    t = np.arange(sr * 2) / sr
+    tone = sine_tone(sr, 2.0, freq=200.0, amp=1.0)
+    audio = tone * np.where(t < 1.0, 0.5, 2.0).astype(np.float32)
+    monkeypatch.setattr(
+        tasks,
+        "separate_prompt",
+        lambda chunk, _sr, _prompt, job_id=None: (chunk, np.zeros_like(chunk)),
+    )
+    monkeypatch.setenv("SAM_AUDIO_CHUNK_WORKERS", "1")
+    out = tasks.run_separation_chunked(
+        audio, sr, ["sound"], [1.0], "keep", chunk_seconds=0.5, overlap_seconds=0.05
+    )
+    # Quiet and loud halves keep their relative level; only the global peak moves.
+    quiet = np.max(np.abs(out[: sr // 2]))
+    loud = np.max(np.abs(out[sr + sr // 2 :]))
+    assert loud == pytest.approx(0.95, abs=1e-4)
+    assert quiet / loud == pytest.approx(0.25, rel=1e-3)
+
+
+def test_build_chunk_ranges_covers_input_once() -> None:
+    ranges = tasks._build_chunk_ranges(10, 4, 1)
+    assert ranges.dtype == np.int64
+    assert ranges.tolist() == [[0, 4], [3, 7], [6, 10]]
+    assert tasks._build_chunk_ranges(11, 4, 1).tolist()[-1] == [9, 11]
+    assert tasks._build_chunk_ranges(3, 4, 1).tolist() == [[0, 3]]
+    assert tasks._build_chunk_ranges(0, 4, 1).shape == (0, 2)
+
+
+def test_settings_fingerprint_tracks_hash_algorithm(monkeypatch: pytest.MonkeyPatch) -> None:
+    args = (("sound",), (1.0,), "keep", 8000)
+    current = tasks.build_settings_fingerprint(*args)
+    monkeypatch.setattr(tasks, "hash_algorithm", lambda: "other")
+    tasks.build_settings_fingerprint.cache_clear()
+    try:
+        assert tasks.build_settings_fingerprint(*args) != current
+    finally:
+        tasks.build_settings_fingerprint.cache_clear()
+
+
+def test_link_or_copy_replaces_target_and_cleans_up(tmp_path: Path) -> None:
+    src = tmp_path / "cached.wav"
+    src.write_bytes(b"cached")
+    dst = tmp_path / "out" / "output.wav"
+    dst.parent.mkdir()
+    dst.write_bytes(b"stale")
+    tasks._link_or_copy(src, dst)
+    assert dst.read_bytes() == b"cached"
 
-        assert output_path.exists()
-        out_audio, out_sr = audio_io.read_audio(output_path, target_sr=sr, mono=True)
-        assert out_sr == sr
-        assert out_audio.shape[0] == audio.shape[0]
-        assert len(calls) >= 2
+    with pytest.raises(FileNotFoundError):
+        tasks._link_or_copy(tmp_path / "missing.wav", dst)
+    assert [path.name for path in dst.parent.iterdir()] == ["output.wav"]